@@ -1,14 +1,16 @@
 from __future__ import annotations
 
-import json
 import logging
 import os
+import queue
 import threading
 from datetime import datetime, timezone
-from logging.handlers import RotatingFileHandler
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
 from typing import Mapping
 
+from council.json_codec import dumps as json_dumps
+from council.json_codec import dumps_line as json_dumps_line
 from council.limits import read_positive_int_env
 from council.paths import get_council_home, get_council_log_path
 
@@ -16,12 +18,17 @@ from council.paths import get_council_home, get_council_log_path
 COUNCIL_LOG_LEVEL_ENV_VAR = "COUNCIL_LOG_LEVEL"
 COUNCIL_LOG_MAX_BYTES_ENV_VAR = "COUNCIL_LOG_MAX_BYTES"
 COUNCIL_LOG_BACKUP_COUNT_ENV_VAR = "COUNCIL_LOG_BACKUP_COUNT"
+COUNCIL_LOG_BUFFER_CAPACITY_ENV_VAR = "COUNCIL_LOG_BUFFER_CAPACITY"
+COUNCIL_LOG_FLUSH_INTERVAL_MS_ENV_VAR = "COUNCIL_LOG_FLUSH_INTERVAL_MS"
 COUNCIL_LOG_FILE_NAME = "council.log"
 DEFAULT_LOG_LEVEL_NAME = "INFO"
 DEFAULT_LOG_MAX_BYTES = 5 * 1024 * 1024
 DEFAULT_LOG_BACKUP_COUNT = 5
+DEFAULT_LOG_BUFFER_CAPACITY = 512
+DEFAULT_LOG_FLUSH_INTERVAL_MS = 1000
 LOGGER_NAME = "council.audit"
 MAX_FIELD_LENGTH = 500
+LOG_WRITE_BUFFER_SIZE = 64 * 1024
 
 _VALID_LOG_LEVELS = {
     "CRITICAL": logging.CRITICAL,
@@ -33,18 +40,36 @@ _VALID_LOG_LEVELS = {
 }
 
 
+# Compartilhado por eventos sem dados; tratado como somente leitura.
+_EMPTY_AUDIT_DATA: dict[str, object] = {}
+
+# chmod/fchmod só têm efeito real em POSIX; fora dele o endurecimento é pulado.
+_IS_POSIX = os.name == "posix"
+
 _LOGGER_LOCK = threading.Lock()
 _LOGGER_CONFIGURED = False
 
 
 class _AuditJsonFormatter(logging.Formatter):
+    def __init__(self) -> None:
+        super().__init__()
+        # (segundo epoch, prefixo "YYYY-MM-DDTHH:MM:SS") do último registro formatado.
+        self._timestamp_cache: tuple[int, str] = (-1, "")
+
     def format(self, record: logging.LogRecord) -> str:
+        return json_dumps(self._build_payload(record))
+
+    def format_line(self, record: logging.LogRecord) -> bytes:
+        """Formata o registro como uma linha JSON em bytes UTF-8, pronta para escrita binária."""
+        return json_dumps_line(self._build_payload(record))
+
+    def _build_payload(self, record: logging.LogRecord) -> dict[str, object]:
         event = getattr(record, "audit_event", "") or record.getMessage()
         raw_data = getattr(record, "audit_data", {})
         data = raw_data if isinstance(raw_data, Mapping) else {"value": str(raw_data)}
 
         payload = {
-            "timestamp_utc": datetime.now(timezone.utc).isoformat(),
+            "timestamp_utc": self._format_timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "event": event,
@@ -52,31 +77,65 @@ class _AuditJsonFormatter(logging.Formatter):
         }
         if record.exc_info:
             payload["exception"] = self.formatException(record.exc_info)
-        return json.dumps(payload, ensure_ascii=True, sort_keys=True)
+        return payload
+
+    def _format_timestamp(self, created: float) -> str:
+        """Formata `record.created` em ISO 8601 UTC reaproveitando o prefixo do segundo corrente."""
+        seconds = int(created)
+        microseconds = int((created - seconds) * 1_000_000)
+        cached_seconds, prefix = self._timestamp_cache
+        if seconds != cached_seconds:
+            prefix = datetime.fromtimestamp(seconds, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            self._timestamp_cache = (seconds, prefix)
+        return f"{prefix}.{microseconds:06d}+00:00"
 
 
-class _SecureRotatingFileHandler(RotatingFileHandler):
-    """RotatingFileHandler com criação/reestrição de permissão em modo 0o600."""
+class _BinaryRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler que grava bytes em um stream binário com buffer.
+
+    Com um formatter que expõe `format_line` (como `_AuditJsonFormatter`), o
+    registro é serializado uma única vez direto para bytes, sem passar pela
+    camada de texto; o flush fica a cargo de quem descarrega o lote.
+    """
+
+    def _open(self):
+        return open(self.baseFilename, "ab", buffering=LOG_WRITE_BUFFER_SIZE)
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            line = self._format_line(record)
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self.stream.tell() + len(line) >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(line)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+    def _format_line(self, record: logging.LogRecord) -> bytes:
+        format_line = getattr(self.formatter, "format_line", None)
+        if callable(format_line):
+            return format_line(record)
+        return f"{self.format(record)}{self.terminator}".encode("utf-8")
+
+
+class _SecureRotatingFileHandler(_BinaryRotatingFileHandler):
+    """_BinaryRotatingFileHandler com criação/reestrição de permissão em modo 0o600.
+
+    As permissões são aplicadas a cada abertura do arquivo (inclusive após a
+    rotação), não a cada registro.
+    """
 
     def _open(self):
         def secure_opener(path: str, flags: int) -> int:
             return os.open(path, flags, 0o600)
 
-        stream = open(
-            self.baseFilename,
-            self.mode,
-            encoding=self.encoding,
-            errors=self.errors,
-            opener=secure_opener,
-        )
+        stream = open(self.baseFilename, "ab", buffering=LOG_WRITE_BUFFER_SIZE, opener=secure_opener)
         self._secure_stream_permissions(stream)
         return stream
 
-    def emit(self, record: logging.LogRecord) -> None:
-        if self.stream is not None:
-            self._secure_stream_permissions(self.stream)
-        super().emit(record)
-
     def _secure_stream_permissions(self, stream) -> None:
         fileno = getattr(stream, "fileno", None)
         if not callable(fileno):
@@ -87,6 +146,95 @@ class _SecureRotatingFileHandler(RotatingFileHandler):
             pass
 
 
+class _BufferedAuditHandler(MemoryHandler):
+    """MemoryHandler que acumula eventos e descarrega em lote no handler de arquivo.
+
+    Descarrega ao atingir a capacidade, ao receber um evento ERROR ou superior e,
+    para não reter eventos em períodos ociosos, a cada `flush_interval_seconds`.
+    """
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        *,
+        capacity: int,
+        flush_interval_seconds: float,
+    ) -> None:
+        super().__init__(capacity, flushLevel=logging.ERROR, target=target, flushOnClose=True)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._stop_event = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically,
+            name="council-audit-flush",
+            daemon=True,
+        )
+        self._flusher.start()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            super().flush()
+            if self.target is not None:
+                self.target.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self._stop_event.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+    def _flush_periodically(self) -> None:
+        while not self._stop_event.wait(self._flush_interval_seconds):
+            self.flush()
+
+
+class _AuditQueueHandler(QueueHandler):
+    """Enfileira registros para um QueueListener dono do handler de arquivo.
+
+    O chamador só paga o custo de enfileirar; formatação JSON e escrita em disco
+    acontecem na thread do listener.
+    """
+
+    def __init__(self, record_queue: queue.Queue) -> None:
+        super().__init__(record_queue)
+        self.listener: QueueListener | None = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # O listener roda no mesmo processo: o registro segue intacto (incluindo
+        # exc_info) para o _AuditJsonFormatter.
+        return record
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            listener = self.listener
+            if listener is None:
+                return
+            self.queue.join()
+            for handler in listener.handlers:
+                handler.flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.acquire()
+        try:
+            listener = self.listener
+            self.listener = None
+            if listener is not None:
+                listener.stop()
+                for handler in listener.handlers:
+                    handler.close()
+        finally:
+            self.release()
+        super().close()
+
+
 def get_audit_logger() -> logging.Logger:
     logger = logging.getLogger(LOGGER_NAME)
     global _LOGGER_CONFIGURED
@@ -110,7 +258,15 @@ def log_event(
     level: int = logging.INFO,
     **data: object,
 ) -> None:
-    sanitized_data = {key: _sanitize_log_value(value) for key, value in data.items() if value is not None}
+    if not logger.isEnabledFor(level):
+        return
+    if data:
+        sanitized_data: dict[str, object] = {}
+        for key, value in data.items():
+            if value is not None:
+                sanitized_data[key] = _sanitize_log_value(value)
+    else:
+        sanitized_data = _EMPTY_AUDIT_DATA
     logger.log(
         level,
         event,
@@ -124,26 +280,43 @@ def log_event(
 def _configure_logger(logger: logging.Logger) -> None:
     _clear_handlers(logger)
     logger.propagate = False
-    logger.setLevel(logging.DEBUG)
     log_level = _resolve_log_level_from_env()
+    # O nível também fica no logger: eventos abaixo dele são descartados em
+    # log_event antes de sanitizar os dados ou criar o LogRecord.
+    logger.setLevel(log_level)
     log_max_bytes, log_backup_count = _resolve_rotation_limits_from_env()
+    buffer_capacity, flush_interval_seconds = _resolve_buffering_from_env()
 
     try:
         home = get_council_home(create=True)
         _secure_directory_permissions(home)
         log_path = get_council_log_path()
-        file_handler = _SecureRotatingFileHandler(
+        file_handler_class = _SecureRotatingFileHandler if _IS_POSIX else _BinaryRotatingFileHandler
+        file_handler = file_handler_class(
             log_path,
             maxBytes=log_max_bytes,
             backupCount=log_backup_count,
-            encoding="utf-8",
         )
         file_handler.setLevel(log_level)
         file_handler.setFormatter(_AuditJsonFormatter())
-        logger.addHandler(file_handler)
-        _secure_file_permissions(log_path)
     except OSError:
         logger.addHandler(logging.NullHandler())
+        return
+
+    # logging.shutdown() (registrado pelo próprio módulo logging no atexit) chama
+    # flush/close deste handler, drenando a fila antes do encerramento.
+    buffered_handler = _BufferedAuditHandler(
+        file_handler,
+        capacity=buffer_capacity,
+        flush_interval_seconds=flush_interval_seconds,
+    )
+    buffered_handler.setLevel(log_level)
+    queue_handler = _AuditQueueHandler(queue.Queue())
+    queue_handler.setLevel(log_level)
+    listener = QueueListener(queue_handler.queue, buffered_handler, respect_handler_level=True)
+    queue_handler.listener = listener
+    listener.start()
+    logger.addHandler(queue_handler)
 
 
 def _resolve_log_level_from_env() -> int:
@@ -167,44 +340,83 @@ def _resolve_rotation_limits_from_env() -> tuple[int, int]:
     return max_bytes, backup_count
 
 
+def _resolve_buffering_from_env() -> tuple[int, float]:
+    capacity = read_positive_int_env(COUNCIL_LOG_BUFFER_CAPACITY_ENV_VAR, DEFAULT_LOG_BUFFER_CAPACITY)
+    flush_interval_ms = read_positive_int_env(
+        COUNCIL_LOG_FLUSH_INTERVAL_MS_ENV_VAR,
+        DEFAULT_LOG_FLUSH_INTERVAL_MS,
+    )
+    return capacity, flush_interval_ms / 1000
+
+
 def _sanitize_log_value(value: object) -> object:
+    value_type = type(value)
+    if value_type is str:
+        # Caso mais comum: strings curtas voltam sem a chamada a _truncate_string.
+        if len(value) <= MAX_FIELD_LENGTH:
+            return value
+        return f"{value[:MAX_FIELD_LENGTH]}...[truncated]"
+
+    if value_type in _PASSTHROUGH_LOG_VALUE_TYPES:
+        return value
+
+    sanitizer = _LOG_VALUE_SANITIZERS_BY_TYPE.get(value_type)
+    if sanitizer is not None:
+        return sanitizer(value)
+
+    # Subclasses (ex.: IntEnum, OrderedDict) e ABCs como Mapping caem na checagem por isinstance.
     if isinstance(value, (int, float, bool)):
         return value
 
     if isinstance(value, Path):
-        return _truncate_string(str(value))
+        return _sanitize_path(value)
 
     if isinstance(value, str):
         return _truncate_string(value)
 
     if isinstance(value, Mapping):
-        return {
-            _truncate_string(str(key)): _sanitize_log_value(item_value)
-            for key, item_value in value.items()
-        }
+        return _sanitize_mapping(value)
 
     if isinstance(value, (list, tuple, set)):
-        return [_sanitize_log_value(item) for item in value]
+        return _sanitize_sequence(value)
 
     return _truncate_string(str(value))
 
 
+def _sanitize_path(value: Path) -> str:
+    return _truncate_string(str(value))
+
+
+def _sanitize_mapping(value: Mapping[object, object]) -> dict[str, object]:
+    return {
+        _truncate_string(str(key)): _sanitize_log_value(item_value)
+        for key, item_value in value.items()
+    }
+
+
+def _sanitize_sequence(value: list[object] | tuple[object, ...] | set[object]) -> list[object]:
+    return [_sanitize_log_value(item) for item in value]
+
+
 def _truncate_string(value: str) -> str:
     if len(value) <= MAX_FIELD_LENGTH:
         return value
     return f"{value[:MAX_FIELD_LENGTH]}...[truncated]"
 
 
-def _secure_file_permissions(path: Path) -> None:
-    if not path.exists():
-        return
-    try:
-        os.chmod(path, 0o600)
-    except OSError:
-        pass
+_PASSTHROUGH_LOG_VALUE_TYPES = frozenset({int, float, bool})
+_LOG_VALUE_SANITIZERS_BY_TYPE = {
+    type(Path()): _sanitize_path,
+    dict: _sanitize_mapping,
+    list: _sanitize_sequence,
+    tuple: _sanitize_sequence,
+    set: _sanitize_sequence,
+}
 
 
 def _secure_directory_permissions(directory: Path) -> None:
+    if not _IS_POSIX:
+        return
     try:
         os.chmod(directory, 0o700)
     except OSError:
@@ -1,13 +1,20 @@
+import errno
+import functools
 import json
 import os
 import re
 import shlex
 import shutil
+import stat
+import sys
+import threading
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
 from string import Formatter
 from typing import Any, Literal, Mapping
 
+from council.json_codec import loads as json_loads
 from council.paths import get_user_flow_config_path
 from council.flow_signature import (
     FlowSignatureError,
@@ -23,7 +30,7 @@ FLOW_CONFIG_SOURCE_CWD = "cwd"
 FLOW_CONFIG_SOURCE_USER = "user"
 FLOW_CONFIG_SOURCE_DEFAULT = "default"
 FlowConfigSource = Literal["cli", "env", "cwd", "user", "default"]
-RESERVED_TEMPLATE_KEYS = {"user_prompt", "full_context", "last_output", "instruction"}
+RESERVED_TEMPLATE_KEYS = frozenset({"user_prompt", "full_context", "last_output", "instruction"})
 DISALLOWED_COMMAND_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
     (re.compile(r"\n"), "\\n"),
     (re.compile(r"\r"), "\\r"),
@@ -34,10 +41,25 @@ DISALLOWED_COMMAND_PATTERNS: tuple[tuple[re.Pattern[str], str], ...] = (
     (re.compile(r"\$\{"), "${"),
     (re.compile(r"\$[A-Za-z_][A-Za-z0-9_]*"), "$VAR"),
     (re.compile(r"\$\("), "$("),
-    (re.compile(r"(^|\s)~(?=/|$)"), "~"),
+    (re.compile(r"(?:^|(?<=\s))~(?=/|$)"), "~"),
     (re.compile(r">>"), ">>"),
     (re.compile(r"(?<!>)>(?!>)"), ">"),
 )
+# Todos os padrões acima fundidos em uma única alternação (uma varredura por comando).
+# Os padrões são de largura zero nas bordas para que um match não consuma o contexto
+# (ex.: o espaço antes de `~`) exigido por outro.
+_DISALLOWED_COMMAND_PATTERN = re.compile(
+    "|".join(
+        f"(?P<op{index}>{pattern.pattern})"
+        for index, (pattern, _label) in enumerate(DISALLOWED_COMMAND_PATTERNS)
+    )
+)
+_DISALLOWED_COMMAND_LABELS: Mapping[str, str] = {
+    f"op{index}": label for index, (_pattern, label) in enumerate(DISALLOWED_COMMAND_PATTERNS)
+}
+# Todo padrão acima exige ao menos um destes caracteres: sem nenhum deles no
+# comando, a varredura com regex pode ser pulada.
+_DISALLOWED_COMMAND_TRIGGER_CHARS = frozenset("\n\r&;|`$~>")
 ALLOWED_COMMAND_BINARIES = frozenset({"claude", "gemini", "codex", "ollama", "deepseek"})
 API_ONLY_COMMAND_BINARIES = frozenset({"deepseek"})
 MODEL_FLAG_BY_BINARY: Mapping[str, str] = {
@@ -51,6 +73,13 @@ MODEL_CONFLICT_ALIASES_BY_BINARY: Mapping[str, tuple[str, ...]] = {
     "deepseek": ("--model", "-m"),
 }
 MODEL_VALUE_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._:/-]*$")
+# Caracteres que exigem o lexer completo do shlex: aspas, escape e espaços ASCII
+# que `str.split()` trata como separador mas o shlex não.
+_SHLEX_FALLBACK_CHARS = frozenset("\"'\\\x0b\x0c\x1c\x1d\x1e\x1f")
+_WHICH_CACHE: dict[tuple[str, str], str] = {}
+_FLOW_STEPS_CACHE_LOCK = threading.Lock()
+# caminho -> (conteúdo bruto, passos parseados)
+_FLOW_STEPS_CACHE: dict[Path, tuple[bytes, tuple["FlowStep", ...]]] = {}
 _TEMPLATE_FORMATTER = Formatter()
 _TEMPLATE_FIELD_BASE_PATTERN = re.compile(r"[.\[]")
 
@@ -59,7 +88,7 @@ class ConfigError(Exception):
     """Erro de configuração do fluxo de agentes."""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class FlowStep:
     key: str
     agent_name: str
@@ -83,6 +112,12 @@ class ResolvedFlowConfig:
 
 
 def get_default_flow_steps() -> list[FlowStep]:
+    return list(_default_flow_steps())
+
+
+@functools.cache
+def _default_flow_steps() -> tuple[FlowStep, ...]:
+    """Passos padrão construídos uma única vez (FlowStep é imutável)."""
     plan_instruction = (
         "Você é um arquiteto de software sênior, pragmático e orientado a entregas. "
         "Analise o requisito abaixo e produza um plano de implementação estruturado contendo:\n\n"
@@ -142,7 +177,7 @@ def get_default_flow_steps() -> list[FlowStep]:
         "Seja direto e objetivo."
     )
 
-    return [
+    return (
         FlowStep(
             key="plan",
             agent_name="Claude",
@@ -192,7 +227,7 @@ def get_default_flow_steps() -> list[FlowStep]:
             input_template="{instruction}\n\nPLANO CONSOLIDADO:\n{final_plan}\n\nCÓDIGO:\n{code}",
             style="dodger_blue1",
         ),
-    ]
+    )
 
 
 def load_flow_steps(
@@ -219,15 +254,24 @@ def load_flow_steps(
     except FlowSignatureError as exc:
         raise ConfigError(f"Falha na verificação de assinatura em '{resolved_path}': {exc}") from exc
 
-    try:
-        serialized_payload = serialized_payload_bytes.decode("utf-8")
-    except UnicodeDecodeError as exc:
-        raise ConfigError(
-            f"Conteúdo inválido em '{resolved_path}': esperado JSON em UTF-8."
-        ) from exc
+    # A assinatura é verificada acima a cada carga; o cache só evita repetir o
+    # parse/validação quando o conteúdo é idêntico ao da última carga deste caminho.
+    with _FLOW_STEPS_CACHE_LOCK:
+        cached_entry = _FLOW_STEPS_CACHE.get(resolved_path)
+    if cached_entry is not None:
+        cached_payload_bytes, cached_steps = cached_entry
+        if cached_payload_bytes == serialized_payload_bytes:
+            return list(cached_steps)
+
+    steps = _parse_flow_steps_payload(serialized_payload_bytes, resolved_path)
+    with _FLOW_STEPS_CACHE_LOCK:
+        _FLOW_STEPS_CACHE[resolved_path] = (serialized_payload_bytes, tuple(steps))
+    return steps
+
 
+def _parse_flow_steps_payload(serialized_payload_bytes: bytes, resolved_path: Path) -> list[FlowStep]:
     try:
-        payload = json.loads(serialized_payload)
+        payload = json_loads(serialized_payload_bytes)
     except json.JSONDecodeError as exc:
         raise ConfigError(f"JSON inválido em '{resolved_path}': {exc.msg}") from exc
 
@@ -242,7 +286,7 @@ def load_flow_steps(
         duplicates_as_text = ", ".join(sorted(duplicate_keys))
         raise ConfigError(f"Chaves de passos duplicadas: {duplicates_as_text}")
 
-    reserved_conflicts = sorted(step.key for step in steps if step.key in RESERVED_TEMPLATE_KEYS)
+    reserved_conflicts = sorted(RESERVED_TEMPLATE_KEYS.intersection(step.key for step in steps))
     if reserved_conflicts:
         conflicts_as_text = ", ".join(reserved_conflicts)
         raise ConfigError(
@@ -276,20 +320,39 @@ def resolve_flow_config(config_path: str | None) -> ResolvedFlowConfig:
     return ResolvedFlowConfig(path=None, source=FLOW_CONFIG_SOURCE_DEFAULT)
 
 
-def _resolve_flow_config_path(config_path: str | None) -> Path | None:
-    return resolve_flow_config(config_path).path
+_MISSING_PATH_ERRNOS = frozenset({errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP})
 
 
 def _validate_config_path(raw_path: str, source: str) -> Path:
     path = Path(raw_path).expanduser()
-    if not path.exists():
-        raise ConfigError(f"Arquivo de configuração não encontrado ({source}): {path}")
-    if not path.is_file():
+    # Um único stat responde "existe?" e "é arquivo?" (exists() + is_file() fariam dois).
+    try:
+        path_mode = path.stat().st_mode
+    except OSError as exc:
+        # Mesmos erros que Path.exists() trata como "não existe" (inclui laço de symlinks).
+        if exc.errno in _MISSING_PATH_ERRNOS:
+            raise ConfigError(f"Arquivo de configuração não encontrado ({source}): {path}") from None
+        raise ConfigError(f"Falha ao acessar arquivo de configuração ({source}) em '{path}': {exc}") from exc
+    if not stat.S_ISREG(path_mode):
         raise ConfigError(f"O caminho informado ({source}) não é um arquivo: {path}")
     return path
 
 
 def render_step_input(step: FlowStep, context: Mapping[str, str]) -> str:
+    for field_name in _template_field_names(step.input_template):
+        if field_name not in context:
+            raise ConfigError(
+                f"O passo '{step.key}' referencia a variável inexistente '{field_name}' no input_template."
+            )
+    compiled_template = _compiled_template(step.input_template)
+    if compiled_template is not None:
+        parts: list[str] = []
+        for literal_text, field_name in compiled_template:
+            parts.append(literal_text)
+            if field_name is not None:
+                parts.append(format(context[field_name]))
+        return "".join(parts)
+
     try:
         return step.input_template.format_map(context)
     except KeyError as exc:
@@ -299,8 +362,10 @@ def render_step_input(step: FlowStep, context: Mapping[str, str]) -> str:
         ) from exc
 
 
-def _extract_template_variables(input_template: str) -> set[str]:
-    variables: set[str] = set()
+@functools.lru_cache(maxsize=256)
+def _template_field_names(input_template: str) -> tuple[str, ...]:
+    """Nomes-base dos campos do template, na ordem em que aparecem (parse memoizado)."""
+    field_names: list[str] = []
     for _literal, field_name, _format_spec, _conversion in _TEMPLATE_FORMATTER.parse(input_template):
         if field_name is None:
             continue
@@ -308,20 +373,38 @@ def _extract_template_variables(input_template: str) -> set[str]:
         if not cleaned_field_name:
             continue
         base_name = _TEMPLATE_FIELD_BASE_PATTERN.split(cleaned_field_name, maxsplit=1)[0].strip()
-        if base_name:
-            variables.add(base_name)
-    return variables
+        if base_name and base_name not in field_names:
+            field_names.append(base_name)
+    return tuple(field_names)
+
+
+@functools.lru_cache(maxsize=256)
+def _compiled_template(input_template: str) -> tuple[tuple[str, str | None], ...] | None:
+    """Pares (literal, campo) do template, ou None se exigir o `format_map` completo.
+
+    Só templates com campos simples (`{nome}`, sem conversão, format spec,
+    atributo ou índice) são pré-compilados.
+    """
+    compiled: list[tuple[str, str | None]] = []
+    for literal_text, field_name, format_spec, conversion in _TEMPLATE_FORMATTER.parse(input_template):
+        if field_name is not None and (format_spec or conversion or not field_name.isidentifier()):
+            return None
+        compiled.append((literal_text, field_name))
+    return tuple(compiled)
+
+
+def _extract_template_variables(input_template: str) -> frozenset[str]:
+    return frozenset(_template_field_names(input_template))
 
 
 def validate_flow_template_references(steps: list[FlowStep]) -> None:
     available_variables = set(RESERVED_TEMPLATE_KEYS)
     for step in steps:
         referenced_variables = _extract_template_variables(step.input_template)
-        missing_variables = sorted(
-            variable for variable in referenced_variables if variable not in available_variables
-        )
+        missing_variables = referenced_variables - available_variables
         if missing_variables:
-            missing_key = missing_variables[0]
+            # Ordena só no caminho de erro para manter a mensagem determinística.
+            missing_key = min(missing_variables)
             raise ConfigError(
                 f"O passo '{step.key}' referencia a variável inexistente '{missing_key}' no input_template."
             )
@@ -344,16 +427,18 @@ def _parse_step(raw_step: Any, position: int) -> FlowStep:
     if not isinstance(raw_step, dict):
         raise ConfigError(f"Passo #{position} inválido: esperado objeto JSON.")
 
-    key = _get_string(raw_step, ["key", "id"], required=False) or f"step_{position}"
+    # Chaves viram nomes de variáveis de template e chaves do contexto a cada passo;
+    # internar permite comparação por identidade nas buscas em dict/set.
+    key = sys.intern(_get_string(raw_step, ["key", "id"], required=False) or f"step_{position}")
     agent_name = _get_string(raw_step, ["agent_name", "agent"], required=True, step=position)
     role_desc = _get_string(raw_step, ["role_desc", "role"], required=True, step=position)
     command = _get_string(raw_step, ["command"], required=True, step=position)
-    _validate_command(command, step=position)
+    _validate_command_syntax(command, step=position)
     model = _get_string(raw_step, ["model"], required=False, step=position)
     if model is not None:
         _validate_model_value(model, step=position)
         command = _inject_model_into_command(command, model, step=position)
-        _validate_command(command, step=position)
+        _validate_command_syntax(command, step=position)
     instruction = _get_string(raw_step, ["instruction"], required=True, step=position)
     input_template = (
         _get_string(raw_step, ["input_template"], required=False)
@@ -428,40 +513,46 @@ def _get_optional_positive_int(source: dict[str, Any], field_name: str, step: in
     return value
 
 
-def _validate_command(command: str, step: int) -> None:
-    disallowed_operators = [
-        label for pattern, label in DISALLOWED_COMMAND_PATTERNS if pattern.search(command)
-    ]
-    if disallowed_operators:
-        operators_as_text = ", ".join(disallowed_operators)
-        raise ConfigError(
-            f"O campo 'command' no passo #{step} contém operadores de shell não permitidos ({operators_as_text})."
-        )
+def validate_command_binary(binary: str) -> None:
+    """Confere se o binário de um comando CLI existe no PATH.
+
+    A checagem não acontece no parse do fluxo: é feita pelo Executor antes de
+    executar o passo (e pelas verificações de pré-requisitos). Providers
+    API-only não exigem binário local.
+    """
+    if binary in API_ONLY_COMMAND_BINARIES:
+        return
+    if _which_cached(binary) is None:
+        raise ConfigError(f"O comando usa binário inexistente no PATH: '{binary}'.")
+
+
+def _validate_command_syntax(command: str, step: int) -> None:
+    if not _DISALLOWED_COMMAND_TRIGGER_CHARS.isdisjoint(command):
+        matched_groups = {match.lastgroup for match in _DISALLOWED_COMMAND_PATTERN.finditer(command)}
+        disallowed_operators = [
+            label for group_name, label in _DISALLOWED_COMMAND_LABELS.items() if group_name in matched_groups
+        ]
+        if disallowed_operators:
+            operators_as_text = ", ".join(disallowed_operators)
+            raise ConfigError(
+                f"O campo 'command' no passo #{step} contém operadores de shell não permitidos ({operators_as_text})."
+            )
 
     try:
-        tokens = shlex.split(command)
+        binary = _command_binary(command)
     except ValueError as exc:
         raise ConfigError(
             f"O campo 'command' no passo #{step} possui sintaxe inválida: {exc}."
         ) from exc
 
-    if not tokens:
+    if binary is None:
         raise ConfigError(f"O campo 'command' no passo #{step} não pode ser vazio.")
 
-    binary = tokens[0]
     if "/" in binary or "\\" in binary:
         raise ConfigError(
             f"O campo 'command' no passo #{step} deve usar apenas o nome do binário, sem caminho explícito: '{binary}'."
         )
 
-    if binary in API_ONLY_COMMAND_BINARIES:
-        return
-
-    if shutil.which(binary) is None:
-        raise ConfigError(
-            f"O campo 'command' no passo #{step} usa binário inexistente no PATH: '{binary}'."
-        )
-
     if binary not in ALLOWED_COMMAND_BINARIES:
         allowed_bins_text = ", ".join(sorted(ALLOWED_COMMAND_BINARIES))
         raise ConfigError(
@@ -470,6 +561,45 @@ def _validate_command(command: str, step: int) -> None:
         )
 
 
+def _split_command(command: str) -> list[str]:
+    """Equivalente a `shlex.split`, com atalho para comandos sem aspas/escapes.
+
+    Para texto ASCII sem aspas, barra invertida ou separadores que só `str.split`
+    reconhece, ambos produzem os mesmos tokens.
+    """
+    if command.isascii() and _SHLEX_FALLBACK_CHARS.isdisjoint(command):
+        return command.split()
+    return shlex.split(command)
+
+
+def _command_binary(command: str) -> str | None:
+    """Retorna o primeiro token de `command` (ou None se vazio).
+
+    Sem aspas/escapes basta separar o primeiro token; caso contrário o comando
+    inteiro passa pelo `shlex`, que também valida a sintaxe.
+    """
+    if command.isascii() and _SHLEX_FALLBACK_CHARS.isdisjoint(command):
+        tokens = command.split(maxsplit=1)
+    else:
+        tokens = shlex.split(command)
+    return tokens[0] if tokens else None
+
+
+def _which_cached(binary: str) -> str | None:
+    """`shutil.which` memoizado por (binário, PATH).
+
+    Só resultados positivos são guardados, para que um binário instalado depois
+    do primeiro carregamento seja encontrado sem reiniciar o processo.
+    """
+    cache_key = (binary, os.environ.get("PATH", os.defpath))
+    resolved = _WHICH_CACHE.get(cache_key)
+    if resolved is None:
+        resolved = shutil.which(binary)
+        if resolved is not None:
+            _WHICH_CACHE[cache_key] = resolved
+    return resolved
+
+
 def _validate_model_value(model: str, step: int) -> None:
     if not model:
         raise ConfigError(f"O campo 'model' no passo #{step} não pode ser vazio.")
@@ -481,7 +611,7 @@ def _validate_model_value(model: str, step: int) -> None:
 
 
 def _inject_model_into_command(command: str, model: str, step: int) -> str:
-    tokens = shlex.split(command)
+    tokens = _split_command(command)
     binary = tokens[0]
     model_flag = MODEL_FLAG_BY_BINARY.get(binary)
     if model_flag is None:
@@ -515,12 +645,12 @@ def _get_bool(source: dict[str, Any], field_name: str, default: bool) -> bool:
 
 
 def _find_duplicate_keys(keys: list[str]) -> set[str]:
-    duplicates = set()
-    seen = set()
+    if len(set(keys)) == len(keys):
+        return set()
+    return {key for key, count in Counter(keys).items() if count > 1}
 
-    for key in keys:
-        if key in seen:
-            duplicates.add(key)
-        seen.add(key)
 
-    return duplicates
+def _reset_config_caches_for_tests() -> None:
+    _WHICH_CACHE.clear()
+    with _FLOW_STEPS_CACHE_LOCK:
+        _FLOW_STEPS_CACHE.clear()
@@ -1,18 +1,28 @@
+import functools
 import subprocess
+import sys
 import shlex
 import threading
 import os
+import queue
+import selectors
 import signal
-import tempfile
 import logging
 import json
-import urllib.error
+import base64
+import http.client
+import urllib.parse
 import urllib.request
-from dataclasses import dataclass
-from time import perf_counter
-from typing import TextIO
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from time import monotonic, perf_counter
+from typing import Any, Iterator, Sequence
 
 from council.audit_log import get_audit_logger, log_event
+from council.config import ConfigError, validate_command_binary
+from council.json_codec import dumps_bytes as json_dumps_bytes
+from council.json_codec import loads as json_loads
 from council.limits import read_positive_int_env
 from council.ui import UI
 
@@ -24,8 +34,25 @@ MAX_OUTPUT_CHARS_ENV_VAR = "COUNCIL_MAX_OUTPUT_CHARS"
 OUTPUT_TRUNCATION_NOTICE = (
     "[... saída truncada para o limite configurado; conteúdo completo descartado para preservar memória ...]\n"
 )
+STREAM_READ_CHUNK_SIZE = 64 * 1024
+STREAM_POLL_INTERVAL_SECONDS = 0.1
+STDERR_TAIL_BYTES = 16 * 1024
+TERMINATE_GRACE_PERIOD_SECONDS = 1
+# Mesmo teto de paralelismo padrão de `run_batch`: mais conexões ociosas não seriam reusadas.
+_MAX_IDLE_HTTP_CONNECTIONS_PER_KEY = os.cpu_count() or 4
+_MAX_UTF8_BYTES_PER_CHAR = 4
+_ASCII_WHITESPACE = b" \t\n\r\x0b\x0c"
+INPUT_PLACEHOLDER = "{input}"
+# Grupo de processos próprio para o filho (pgid == pid), alvo do killpg no encerramento.
+# A partir do 3.11, process_group=0 evita o setsid() de start_new_session e mantém o
+# filho elegível ao caminho rápido de spawn (vfork/posix_spawn) do subprocess.
+_NEW_PROCESS_GROUP_KWARGS: dict[str, Any] = (
+    {"process_group": 0} if sys.version_info >= (3, 11) else {"start_new_session": True}
+)
 CLI_INPUT_BLOCK_START = "===COUNCIL_INPUT_ARGV_START==="
 CLI_INPUT_BLOCK_END = "===COUNCIL_INPUT_ARGV_END==="
+_ARGV_PAYLOAD_PREFIX = f"{CLI_INPUT_BLOCK_START}\nPROMPT INTEGRAL ENVIADO VIA ARGV.\n"
+_ARGV_PAYLOAD_SUFFIX = f"\n{CLI_INPUT_BLOCK_END}"
 DEEPSEEK_COMMAND_NAME = "deepseek"
 DEEPSEEK_API_KEY_ENV_VAR = "DEEPSEEK_API_KEY"
 DEEPSEEK_API_BASE_URL_ENV_VAR = "DEEPSEEK_API_BASE_URL"
@@ -33,12 +60,28 @@ DEFAULT_DEEPSEEK_API_BASE_URL = "https://api.deepseek.com"
 DEFAULT_DEEPSEEK_MODEL = "deepseek-chat"
 
 
+# Opção do comando deepseek -> campo de _DeepSeekCommandConfig (valor em `--opt v` ou `--opt=v`).
+_DEEPSEEK_OPTION_FIELDS = {
+    "--model": "model",
+    "-m": "model",
+    "--temperature": "temperature",
+    "-t": "temperature",
+    "--max-tokens": "max_tokens",
+    "--base-url": "base_url",
+}
+
+
 @dataclass(frozen=True)
 class _DeepSeekCommandConfig:
     model: str = DEFAULT_DEEPSEEK_MODEL
     base_url: str = DEFAULT_DEEPSEEK_API_BASE_URL
     temperature: float | None = None
     max_tokens: int | None = None
+    endpoint: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        # Calculado uma vez: a config fica em cache e é reaproveitada a cada passo.
+        object.__setattr__(self, "endpoint", f"{self.base_url}/chat/completions")
 
 class CommandError(Exception):
     """Exceção levantada quando um subprocesso falha."""
@@ -48,6 +91,164 @@ class ExecutionAborted(CommandError):
     """Execução interrompida pelo usuário."""
     pass
 
+
+def _with_truncation_notice(truncated_output: str) -> str:
+    """Prefixa o aviso de truncamento à cauda já sem espaços nas bordas."""
+    if not truncated_output:
+        return OUTPUT_TRUNCATION_NOTICE.rstrip()
+    return OUTPUT_TRUNCATION_NOTICE + truncated_output
+
+
+@functools.lru_cache(maxsize=128)
+def _tokenize(command: str) -> tuple[str, ...]:
+    """Divide o comando em tokens (shlex); cacheado porque os mesmos comandos se repetem a cada rodada."""
+    return tuple(shlex.split(command))
+
+
+@functools.lru_cache(maxsize=64)
+def _parse_deepseek_options(command_tokens: tuple[str, ...], env_base_url: str) -> _DeepSeekCommandConfig:
+    """Interpreta as opções do comando deepseek; cacheado por tokens + URL base do ambiente."""
+    if not command_tokens or command_tokens[0] != DEEPSEEK_COMMAND_NAME:
+        raise CommandError("Comando DeepSeek inválido.")
+
+    model = DEFAULT_DEEPSEEK_MODEL
+    base_url = env_base_url.strip()
+    temperature: float | None = None
+    max_tokens: int | None = None
+
+    index = 1
+    while index < len(command_tokens):
+        option, has_inline_value, inline_value = command_tokens[index].partition("=")
+        # Só opções longas aceitam "--opção=valor"; formas como "-m=x" continuam inválidas.
+        if has_inline_value and not option.startswith("--"):
+            field_name = None
+        else:
+            field_name = _DEEPSEEK_OPTION_FIELDS.get(option)
+        if field_name is None:
+            raise CommandError(
+                "Comando deepseek inválido. Opções suportadas: "
+                "--model/-m, --temperature/-t, --max-tokens e --base-url."
+            )
+        if has_inline_value:
+            raw_value = inline_value.strip()
+            index += 1
+        else:
+            raw_value, index = _read_required_token_value(command_tokens, index, option)
+
+        if field_name == "model":
+            model = _require_inline_value(raw_value, option)
+        elif field_name == "base_url":
+            base_url = _require_inline_value(raw_value, option)
+        elif field_name == "temperature":
+            try:
+                temperature = float(raw_value)
+            except ValueError as exc:
+                raise CommandError(f"Valor inválido para {option}: {raw_value}") from exc
+        else:
+            max_tokens = _parse_positive_int_value(raw_value, option)
+
+    normalized_base_url = base_url.strip().rstrip("/")
+    if not normalized_base_url:
+        raise CommandError("URL base da API DeepSeek não pode ser vazia.")
+    if not model.strip():
+        raise CommandError("Modelo DeepSeek não pode ser vazio.")
+
+    return _DeepSeekCommandConfig(
+        model=model.strip(),
+        base_url=normalized_base_url,
+        temperature=temperature,
+        max_tokens=max_tokens,
+    )
+
+
+def _require_inline_value(raw_value: str, option_name: str) -> str:
+    if not raw_value:
+        raise CommandError(f"Valor de {option_name} não pode ser vazio no comando deepseek.")
+    return raw_value
+
+
+def _read_required_token_value(
+    command_tokens: Sequence[str],
+    current_index: int,
+    option_name: str,
+) -> tuple[str, int]:
+    next_index = current_index + 1
+    if next_index >= len(command_tokens):
+        raise CommandError(f"O comando deepseek exige valor para {option_name}.")
+    value = command_tokens[next_index].strip()
+    if not value:
+        raise CommandError(f"O comando deepseek exige valor não vazio para {option_name}.")
+    return value, next_index + 1
+
+
+def _parse_positive_int_value(raw_value: str, option_name: str) -> int:
+    try:
+        parsed = int(raw_value)
+    except ValueError as exc:
+        raise CommandError(f"Valor inválido para {option_name}: {raw_value}") from exc
+    if parsed <= 0:
+        raise CommandError(f"{option_name} deve ser um inteiro positivo.")
+    return parsed
+
+
+def _resolve_http_proxy(parts: urllib.parse.SplitResult) -> urllib.parse.SplitResult | None:
+    """Proxy de HTTP_PROXY/HTTPS_PROXY (respeitando NO_PROXY), como faria o urllib."""
+    proxy_url = urllib.request.getproxies().get(parts.scheme)
+    if not proxy_url or urllib.request.proxy_bypass(parts.hostname or ""):
+        return None
+    if "://" not in proxy_url:
+        proxy_url = f"http://{proxy_url}"
+    proxy = urllib.parse.urlsplit(proxy_url)
+    return proxy if proxy.hostname else None
+
+
+def _proxy_auth_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+    if proxy.username is None:
+        return {}
+    credentials = (
+        f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+    )
+    token = base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+    return {"Proxy-Authorization": f"Basic {token}"}
+
+
+class _LineEmitter:
+    """Repassa texto recebido em pedaços ao on_output, uma linha completa por vez (ou em lote)."""
+
+    def __init__(self, on_output, *, batched: bool = False) -> None:
+        self._on_output = on_output
+        self._batched = batched
+        # Pedaços da linha ainda incompleta; unidos só quando a linha termina.
+        self._pending: list[str] = []
+
+    def feed(self, text: str) -> None:
+        if self._on_output is None or not text:
+            return
+        line_end = text.rfind("\n")
+        if line_end < 0:
+            self._pending.append(text)
+            return
+        self._pending.append(text[:line_end])
+        complete = "".join(self._pending)
+        self._pending = [text[line_end + 1 :]]
+        self._emit(complete)
+
+    def flush(self) -> None:
+        if self._on_output is None:
+            return
+        pending = "".join(self._pending)
+        self._pending = []
+        if pending:
+            self._emit(pending)
+
+    def _emit(self, text: str) -> None:
+        if self._batched:
+            self._on_output(text)
+            return
+        for line in text.split("\n"):
+            self._on_output(line)
+
+
 class Executor:
     """Responsável por orquestrar subprocessos CLI capturando stdin/stdout."""
     def __init__(
@@ -77,19 +278,37 @@ class Executor:
             raise ValueError("max_output_chars deve ser um inteiro positivo.")
         self._cancel_event = threading.Event()
         self._process_lock = threading.Lock()
-        self._current_process: subprocess.Popen | None = None
+        self._running_processes: set[subprocess.Popen] = set()
+        # Conexões HTTP ociosas por (esquema, host:porta), reaproveitadas via keep-alive.
+        self._http_lock = threading.Lock()
+        self._idle_http_connections: dict[tuple[str, str, str], list[http.client.HTTPConnection]] = {}
         self._audit_logger = get_audit_logger()
 
     def request_cancel(self) -> None:
+        """
+        Sinaliza o cancelamento e pede o encerramento dos processos em execução sem
+        bloquear quem chamou (em geral a thread da UI). A espera pelo período de
+        graça e a escalada para SIGKILL ficam com a thread que executa o comando,
+        que observa o cancelamento a cada tick do laço de leitura.
+        """
         self._cancel_event.set()
         log_event(self._audit_logger, "executor.cancel.requested", level=logging.INFO)
         with self._process_lock:
-            process = self._current_process
-
-        if process is None or process.poll() is not None:
-            return
-
-        self._terminate_process(process)
+            processes = list(self._running_processes)
+
+        for process in processes:
+            if process.poll() is None:
+                self._request_terminate(process)
+
+    def close(self) -> None:
+        """Fecha as conexões HTTP ociosas mantidas para keep-alive."""
+        with self._http_lock:
+            connections = [
+                connection for idle in self._idle_http_connections.values() for connection in idle
+            ]
+            self._idle_http_connections.clear()
+        for connection in connections:
+            connection.close()
 
     def run_cli(
         self,
@@ -99,6 +318,7 @@ class Executor:
         on_output=None,
         max_input_chars: int | None = None,
         max_output_chars: int | None = None,
+        on_output_batched: bool = False,
     ) -> str:
         """
         Executa um comando CLI via subprocess, injetando dados via stdin.
@@ -108,29 +328,124 @@ class Executor:
         - Se o comando contiver o placeholder literal {input},
           o conteúdo de input_data é injetado como argumento literal no argv final,
           e nada é enviado via stdin.
+        - Com on_output_batched=True, on_output recebe de uma vez todas as linhas
+          completas de cada leitura do pipe (unidas por `\n`), em vez de uma
+          chamada por linha.
+        """
+        # Executor instances can be reused; avoid stale cancel state from previous runs.
+        self._cancel_event.clear()
+        return self._run_cli(
+            command,
+            input_data,
+            timeout=timeout,
+            on_output=on_output,
+            max_input_chars=max_input_chars,
+            max_output_chars=max_output_chars,
+            on_output_batched=on_output_batched,
+        )
+
+    def run_batch(
+        self,
+        specs: Sequence[tuple[str, str]],
+        timeout: int = 120,
+        on_output=None,
+        on_output_batched: bool = False,
+        max_workers: int | None = None,
+    ) -> list[str]:
+        """
+        Executa comandos independentes (pares `(command, input_data)`) em paralelo.
+
+        Cada comando segue as mesmas regras de `run_cli`; as saídas voltam na ordem
+        de `specs`. No máximo `max_workers` subprocessos rodam ao mesmo tempo (padrão:
+        número de CPUs); os demais aguardam na fila. Se algum falhar, os que rodam são
+        cancelados, os da fila nem iniciam e a primeira falha é relançada.
+        `request_cancel` interrompe todos.
         """
+        if not specs:
+            return []
+        if max_workers is None:
+            max_workers = os.cpu_count() or 4
+        if max_workers <= 0:
+            raise ValueError("max_workers deve ser um inteiro positivo.")
+
+        failures: list[BaseException] = []
+        failures_lock = threading.Lock()
+
+        def run_spec(command: str, input_data: str) -> str:
+            # Comandos ainda na fila quando o lote é cancelado nem chegam a iniciar.
+            if self._cancel_event.is_set():
+                raise ExecutionAborted("Execução abortada pelo usuário.")
+            try:
+                return self._run_cli(
+                    command,
+                    input_data,
+                    timeout=timeout,
+                    on_output=on_output,
+                    on_output_batched=on_output_batched,
+                )
+            except BaseException as exc:
+                # A falha é registrada antes do cancelamento: os abortos que ele
+                # provoca nos demais comandos nunca passam à frente dela.
+                with failures_lock:
+                    is_first_failure = not failures
+                    failures.append(exc)
+                if is_first_failure:
+                    self._cancel_event.set()
+                    self._terminate_running_processes()
+                raise
+
+        self._cancel_event.clear()
+        with ThreadPoolExecutor(
+            max_workers=min(len(specs), max_workers),
+            thread_name_prefix="council-batch",
+        ) as pool:
+            futures = [pool.submit(run_spec, command, input_data) for command, input_data in specs]
+
+        if failures:
+            raise failures[0]
+        return [future.result() for future in futures]
+
+    def _terminate_running_processes(self) -> None:
+        with self._process_lock:
+            processes = list(self._running_processes)
+
+        for process in processes:
+            if process.poll() is None:
+                self._terminate_process(process)
+
+    def _run_cli(
+        self,
+        command: str,
+        input_data: str,
+        timeout: int = 120,
+        on_output=None,
+        max_input_chars: int | None = None,
+        max_output_chars: int | None = None,
+        on_output_batched: bool = False,
+    ) -> str:
         process: subprocess.Popen | None = None
-        output_spool: TextIO | None = None
+        output_overflowed = False
         command_display = command
         run_started_perf = perf_counter()
         error_logged = False
         try:
-            # Executor instances can be reused; avoid stale cancel state from previous runs.
-            self._cancel_event.clear()
-
             if timeout <= 0:
                 self.ui.show_error("Timeout inválido: informe um inteiro positivo.")
                 raise CommandError("Timeout inválido")
 
-            effective_max_input_chars = self.max_input_chars if max_input_chars is None else max_input_chars
-            effective_max_output_chars = self.max_output_chars if max_output_chars is None else max_output_chars
-
-            if effective_max_input_chars <= 0:
-                self.ui.show_error("max_input_chars inválido: informe um inteiro positivo.")
-                raise CommandError("max_input_chars inválido")
-            if effective_max_output_chars <= 0:
-                self.ui.show_error("max_output_chars inválido: informe um inteiro positivo.")
-                raise CommandError("max_output_chars inválido")
+            # Os limites da instância já foram validados no __init__; só overrides por chamada são checados.
+            effective_max_input_chars = self.max_input_chars
+            if max_input_chars is not None:
+                if max_input_chars <= 0:
+                    self.ui.show_error("max_input_chars inválido: informe um inteiro positivo.")
+                    raise CommandError("max_input_chars inválido")
+                effective_max_input_chars = max_input_chars
+            effective_max_output_chars = self.max_output_chars
+            if max_output_chars is not None:
+                if max_output_chars <= 0:
+                    self.ui.show_error("max_output_chars inválido: informe um inteiro positivo.")
+                    raise CommandError("max_output_chars inválido")
+                effective_max_output_chars = max_output_chars
 
             if len(input_data) > effective_max_input_chars:
                 self.ui.show_error(
@@ -141,7 +456,7 @@ class Executor:
                 )
                 raise CommandError(f"Input acima do limite para: {command}")
 
-            command_tokens = shlex.split(command)
+            command_tokens = list(_tokenize(command))
             if self._is_deepseek_command_tokens(command_tokens):
                 command_display = shlex.join(command_tokens)
                 log_event(
@@ -160,6 +475,8 @@ class Executor:
                         command_tokens=command_tokens,
                         input_data=input_data,
                         timeout=timeout,
+                        on_output=on_output,
+                        on_output_batched=on_output_batched,
                     )
                 except ExecutionAborted:
                     raise
@@ -181,9 +498,6 @@ class Executor:
                     deepseek_output,
                     max_chars=effective_max_output_chars,
                 )
-                if on_output and final_output:
-                    for line in final_output.splitlines():
-                        on_output(line)
                 log_event(
                     self._audit_logger,
                     "executor.command.completed",
@@ -198,6 +512,14 @@ class Executor:
 
             command_argv, stdin_payload = self._prepare_command(command, input_data)
             command_display = shlex.join(command_argv)
+            if command_argv:
+                # O parse do flow.json não consulta o PATH; a checagem do binário
+                # acontece aqui, só para os passos que de fato executam.
+                try:
+                    validate_command_binary(command_argv[0])
+                except ConfigError as exc:
+                    self.ui.show_error(f"Falha ao executar '{command_display}': {exc}")
+                    raise CommandError(str(exc)) from exc
             log_event(
                 self._audit_logger,
                 "executor.command.start",
@@ -210,84 +532,151 @@ class Executor:
                 max_output_chars=effective_max_output_chars,
             )
 
+            # O timeout vale para a execução inteira (leitura + espera), não só para o wait final.
+            deadline = monotonic() + timeout
             process = subprocess.Popen(
                 command_argv,
                 shell=False,
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
-                text=True,
-                encoding="utf-8",
-                start_new_session=True,
+                # Os pipes são lidos/escritos via os.read/os.write no fd; sem buffer intermediário.
+                bufsize=0,
+                **_NEW_PROCESS_GROUP_KWARGS,
             )
 
             with self._process_lock:
-                self._current_process = process
+                self._running_processes.add(process)
             
-            # Escreve o input data para a ferramenta pelo stdin
+            # Escreve o input data para a ferramenta pelo stdin em paralelo à leitura
+            # do stdout: um prompt maior que o buffer do pipe não trava um filho que
+            # já começou a responder.
+            stdin_writer: threading.Thread | None = None
             if stdin_payload:
-                process.stdin.write(stdin_payload)
-                process.stdin.flush()
-            process.stdin.close() # Sinaliza FIM DE INPUT para a pipeline não travar
+                stdin_writer = threading.Thread(
+                    target=self._feed_stdin,
+                    args=(process, stdin_payload.encode("utf-8")),
+                    name="council-stdin-writer",
+                    daemon=True,
+                )
+                stdin_writer.start()
+            else:
+                process.stdin.close() # Sinaliza FIM DE INPUT para a pipeline não travar
 
-            stdout_lines = []
-            captured_stdout_chars = 0
-            tail_chunks: list[str] = []
+            tail_chunks: deque[str] = deque()
             tail_chars = 0
 
-            def append_tail(chunk: str) -> tuple[int, list[str]]:
+            def append_tail(chunk: str) -> None:
                 nonlocal tail_chars
                 if not chunk:
-                    return tail_chars, tail_chunks
+                    return
+                if len(chunk) >= effective_max_output_chars:
+                    # O bloco sozinho já preenche a cauda: descarta o restante de uma vez.
+                    tail_chunks.clear()
+                    tail_chunks.append(chunk[-effective_max_output_chars:])
+                    tail_chars = effective_max_output_chars
+                    return
                 tail_chunks.append(chunk)
                 tail_chars += len(chunk)
 
-                while tail_chars > effective_max_output_chars and tail_chunks:
+                while tail_chars > effective_max_output_chars:
                     overflow = tail_chars - effective_max_output_chars
                     first = tail_chunks[0]
                     if len(first) <= overflow:
                         tail_chars -= len(first)
-                        tail_chunks.pop(0)
+                        tail_chunks.popleft()
                         continue
                     tail_chunks[0] = first[overflow:]
                     tail_chars -= overflow
-
-                return tail_chars, tail_chunks
             
-            # Lê o stdout linha a linha em tempo real
-            for line in iter(process.stdout.readline, ''):
+            # Bytes brutos do stdout enquanto couberem no limite; como um caractere
+            # ocupa no máximo 4 bytes em UTF-8, o limite em caracteres só é aferido
+            # (após decodificar) ao final.
+            captured_output = bytearray()
+            capture_limit_bytes = effective_max_output_chars * _MAX_UTF8_BYTES_PER_CHAR
+
+            def consume_output(complete_output: bytes, *, skip_leading_lf: bool = False) -> bool:
+                nonlocal output_overflowed
+                if not output_overflowed and len(captured_output) + len(complete_output) <= capture_limit_bytes:
+                    captured_output.extend(complete_output)
+                else:
+                    if not output_overflowed:
+                        # Acima do limite só a cauda é retornada: o restante é descartado.
+                        output_overflowed = True
+                        append_tail(self._decode_output(captured_output))
+                        captured_output.clear()
+                    append_tail(self._decode_output(complete_output))
+
+                # O \n de um \r\n partido entre leituras já foi contado como fim de linha.
+                stream_output = complete_output[1:] if skip_leading_lf else complete_output
+                if on_output and on_output_batched:
+                    # Uma chamada por leitura: poupa a UI de despachar linha a linha.
+                    # Divide nos bytes (só \n/\r, como no caminho linha a linha) e
+                    # decodifica uma vez o lote já unido.
+                    raw_lines = stream_output.splitlines()
+                    if raw_lines and not self._cancel_event.is_set():
+                        on_output(b"\n".join(raw_lines).decode("utf-8", errors="replace"))
+                elif on_output:
+                    for raw_line in stream_output.splitlines():
+                        if self._cancel_event.is_set():
+                            return False
+                        on_output(raw_line.decode("utf-8", errors="replace"))
+                return not self._cancel_event.is_set()
+
+            # Drena stdout e stderr juntos (evita que o filho trave com um dos pipes
+            # cheio) e repassa as linhas completas do stdout em tempo real.
+            pending_output = bytearray()
+            ended_with_cr = False
+            stderr_output = bytearray()
+            pipes = {process.stdout.fileno(): "stdout", process.stderr.fileno(): "stderr"}
+            for ready in self._iter_pipe_chunks(pipes):
                 if self._cancel_event.is_set():
                     self._terminate_process(process)
                     break
-
-                projected_size = captured_stdout_chars + len(line)
-                if output_spool is None and projected_size <= effective_max_output_chars:
-                    stdout_lines.append(line)
-                    captured_stdout_chars = projected_size
+                if monotonic() >= deadline:
+                    raise subprocess.TimeoutExpired(command_argv, timeout)
+                if ready is None:
+                    continue
+
+                stream_name, chunk = ready
+                if stream_name == "stderr":
+                    # Só a cauda do stderr é mantida: ela só é exibida quando o comando falha.
+                    stderr_output += chunk
+                    if len(stderr_output) > STDERR_TAIL_BYTES:
+                        del stderr_output[:-STDERR_TAIL_BYTES]
+                    continue
+
+                if chunk:
+                    pending_output += chunk
+                    # \r também encerra linha (CLIs que redesenham progresso na mesma linha).
+                    line_end = max(pending_output.rfind(b"\n"), pending_output.rfind(b"\r")) + 1
+                    if not line_end:
+                        continue
+                    complete_output = bytes(pending_output[:line_end])
+                    del pending_output[:line_end]
                 else:
-                    if output_spool is None:
-                        output_spool = tempfile.TemporaryFile(mode="w+", encoding="utf-8")
-                        baseline_output = "".join(stdout_lines)
-                        output_spool.write(baseline_output)
-                        append_tail(baseline_output)
-                        stdout_lines.clear()
-                    output_spool.write(line)
-                    append_tail(line)
-
-                if on_output:
-                    on_output(line.rstrip('\n'))
-
-            # Tenta pegar erros se der merda
-            stderr_content = process.stderr.read()
+                    complete_output = bytes(pending_output)
+                    pending_output.clear()
+
+                skip_leading_lf = ended_with_cr and complete_output.startswith(b"\n")
+                ended_with_cr = complete_output.endswith(b"\r")
+                if not consume_output(complete_output, skip_leading_lf=skip_leading_lf):
+                    self._terminate_process(process)
+                    break
+
             process.stdout.close()
             process.stderr.close()
-            
-            returncode = process.wait(timeout=timeout)
+
+            returncode = process.wait(timeout=max(0.0, deadline - monotonic()))
+            if stdin_writer is not None:
+                # Com o processo encerrado, a escrita pendente termina (ou falha com EPIPE).
+                stdin_writer.join()
 
             if self._cancel_event.is_set():
                 raise ExecutionAborted("Execução abortada pelo usuário.")
             
             if returncode != 0:
+                stderr_content = stderr_output.decode("utf-8", errors="replace")
                 log_event(
                     self._audit_logger,
                     "executor.command.failed",
@@ -303,22 +692,33 @@ class Executor:
                 )
                 raise CommandError(f"Erro no comando: {command_display}")
 
-            if output_spool is None:
-                final_output = "".join(stdout_lines).strip()
-                log_event(
-                    self._audit_logger,
-                    "executor.command.completed",
-                    level=logging.INFO,
-                    command=command_display,
-                    return_code=returncode,
-                    output_chars=len(final_output),
-                    output_truncated=False,
-                    duration_ms=int((perf_counter() - run_started_perf) * 1000),
-                )
-                return final_output
-
-            truncated_output = "".join(tail_chunks).strip()
-            final_output = f"{OUTPUT_TRUNCATION_NOTICE}{truncated_output}".strip()
+            if not output_overflowed:
+                captured_text = self._decode_stripped_output(captured_output)
+                if len(captured_text) <= effective_max_output_chars:
+                    final_output = captured_text
+                    log_event(
+                        self._audit_logger,
+                        "executor.command.completed",
+                        level=logging.INFO,
+                        command=command_display,
+                        return_code=returncode,
+                        output_chars=len(final_output),
+                        output_truncated=False,
+                        duration_ms=int((perf_counter() - run_started_perf) * 1000),
+                    )
+                    return final_output
+                append_tail(captured_text)
+
+            # Apara só as pontas da cauda antes de unir, sem um strip() sobre o texto inteiro.
+            while tail_chunks and (not tail_chunks[-1] or tail_chunks[-1].isspace()):
+                tail_chunks.pop()
+            while tail_chunks and (not tail_chunks[0] or tail_chunks[0].isspace()):
+                tail_chunks.popleft()
+            if tail_chunks:
+                tail_chunks[0] = tail_chunks[0].lstrip()
+                tail_chunks[-1] = tail_chunks[-1].rstrip()
+            truncated_output = "".join(tail_chunks)
+            final_output = _with_truncation_notice(truncated_output)
             log_event(
                 self._audit_logger,
                 "executor.command.completed",
@@ -379,10 +779,101 @@ class Executor:
                 )
             raise
         finally:
-            if output_spool is not None:
-                output_spool.close()
-            with self._process_lock:
-                self._current_process = None
+            if process is not None:
+                with self._process_lock:
+                    self._running_processes.discard(process)
+
+    def _decode_output(self, data: bytes | bytearray) -> str:
+        """Decodifica saída da CLI normalizando quebras de linha (CRLF e CR viram LF)."""
+        return data.decode("utf-8", errors="replace").replace("\r\n", "\n").replace("\r", "\n")
+
+    def _decode_stripped_output(self, data: bytearray) -> str:
+        """
+        Como `_decode_output(data).strip()`, mas descarta os espaços ASCII das
+        bordas antes de decodificar (via memoryview, sem copiar o buffer).
+        """
+        start, end = 0, len(data)
+        while start < end and data[start] in _ASCII_WHITESPACE:
+            start += 1
+        while end > start and data[end - 1] in _ASCII_WHITESPACE:
+            end -= 1
+        with memoryview(data)[start:end] as view:
+            text = str(view, "utf-8", "replace")
+        return text.replace("\r\n", "\n").replace("\r", "\n").strip()
+
+    def _write_stdin_payload(self, process: subprocess.Popen, payload: bytes) -> None:
+        """
+        Escreve o payload já codificado direto no fd do stdin, tratando escritas parciais.
+        Se o processo encerrar sem ler tudo (BrokenPipeError), o restante é descartado
+        e o código de saída decide o resultado.
+        """
+        stdin_fd = process.stdin.fileno()
+        remaining = memoryview(payload)
+        try:
+            while remaining:
+                written = os.write(stdin_fd, remaining)
+                remaining = remaining[written:]
+        except BrokenPipeError:
+            pass
+
+    def _feed_stdin(self, process: subprocess.Popen, payload: bytes) -> None:
+        """Escreve o payload no stdin e o fecha, sinalizando FIM DE INPUT."""
+        try:
+            self._write_stdin_payload(process, payload)
+        finally:
+            try:
+                process.stdin.close()
+            except BrokenPipeError:
+                pass
+
+    def _iter_pipe_chunks(self, pipes: dict[int, str]) -> Iterator[tuple[str, bytes] | None]:
+        """
+        Lê blocos dos pipes informados (fd -> nome) conforme ficam prontos.
+        Gera (nome, bloco), com bloco vazio indicando EOF daquele pipe, ou None
+        a cada intervalo ocioso, para o chamador checar cancelamento.
+        """
+        if os.name == "nt":
+            # select() no Windows só aceita sockets: uma thread por pipe alimenta a fila.
+            yield from self._iter_pipe_chunks_with_threads(pipes)
+            return
+
+        with selectors.DefaultSelector() as selector:
+            for fd, name in pipes.items():
+                selector.register(fd, selectors.EVENT_READ, name)
+            while selector.get_map():
+                ready = selector.select(timeout=STREAM_POLL_INTERVAL_SECONDS)
+                if not ready:
+                    yield None
+                    continue
+                for key, _ in ready:
+                    chunk = os.read(key.fd, STREAM_READ_CHUNK_SIZE)
+                    if not chunk:
+                        selector.unregister(key.fd)
+                    yield key.data, chunk
+
+    def _iter_pipe_chunks_with_threads(self, pipes: dict[int, str]) -> Iterator[tuple[str, bytes] | None]:
+        chunks: queue.Queue[tuple[str, bytes]] = queue.Queue()
+
+        def drain(fd: int, name: str) -> None:
+            while True:
+                chunk = os.read(fd, STREAM_READ_CHUNK_SIZE)
+                chunks.put((name, chunk))
+                if not chunk:
+                    return
+
+        for fd, name in pipes.items():
+            threading.Thread(target=drain, args=(fd, name), daemon=True).start()
+
+        open_pipes = len(pipes)
+        while open_pipes:
+            try:
+                name, chunk = chunks.get(timeout=STREAM_POLL_INTERVAL_SECONDS)
+            except queue.Empty:
+                yield None
+                continue
+            if not chunk:
+                open_pipes -= 1
+            yield name, chunk
 
     def _is_deepseek_command_tokens(self, command_tokens: list[str]) -> bool:
         return bool(command_tokens) and command_tokens[0] == DEEPSEEK_COMMAND_NAME
@@ -393,6 +884,8 @@ class Executor:
         command_tokens: list[str],
         input_data: str,
         timeout: int,
+        on_output=None,
+        on_output_batched: bool = False,
     ) -> str:
         if self._cancel_event.is_set():
             raise ExecutionAborted("Execução abortada pelo usuário.")
@@ -407,140 +900,206 @@ class Executor:
         payload: dict[str, object] = {
             "model": command_config.model,
             "messages": [{"role": "user", "content": input_data}],
-            "stream": False,
+            # Resposta em SSE: o texto chega (e é repassado ao on_output) conforme é gerado.
+            "stream": True,
         }
         if command_config.temperature is not None:
             payload["temperature"] = command_config.temperature
         if command_config.max_tokens is not None:
             payload["max_tokens"] = command_config.max_tokens
 
-        endpoint = f"{command_config.base_url}/chat/completions"
-        request = urllib.request.Request(
-            endpoint,
-            data=json.dumps(payload).encode("utf-8"),
-            headers={
-                "Authorization": f"Bearer {api_key}",
-                "Content-Type": "application/json",
-                "Accept": "application/json",
-            },
-            method="POST",
-        )
+        emitter = _LineEmitter(on_output, batched=on_output_batched)
+        try:
+            pool_key, connection, response = self._open_http_response(
+                command_config.endpoint,
+                body=json_dumps_bytes(payload),
+                headers={
+                    "Authorization": f"Bearer {api_key}",
+                    "Content-Type": "application/json",
+                    "Accept": "text/event-stream, application/json",
+                },
+                timeout=timeout,
+            )
+        except (OSError, http.client.HTTPException) as exc:
+            raise CommandError(f"Falha de conexão com a API DeepSeek: {exc}") from exc
 
+        released = False
         try:
-            with urllib.request.urlopen(request, timeout=timeout) as response:
+            if response.status >= 400:
+                error_body = response.read().decode("utf-8", errors="replace")
+                self._release_http_connection(pool_key, connection, response)
+                released = True
+                error_message = (
+                    self._extract_deepseek_error_message(error_body)
+                    or f"HTTP Error {response.status}: {response.reason}"
+                )
+                raise CommandError(f"API DeepSeek retornou erro HTTP {response.status}: {error_message}")
+
+            content_type = response.getheader("Content-Type") or ""
+            if "text/event-stream" in content_type:
+                text = self._read_deepseek_event_stream(response, emitter)
+            else:
+                # Servidores compatíveis podem ignorar "stream" e responder com um JSON único.
                 raw_response = response.read().decode("utf-8", errors="replace")
-        except urllib.error.HTTPError as exc:
-            error_body = exc.read().decode("utf-8", errors="replace")
-            error_message = self._extract_deepseek_error_message(error_body) or str(exc)
-            raise CommandError(f"API DeepSeek retornou erro HTTP {exc.code}: {error_message}") from exc
-        except urllib.error.URLError as exc:
-            raise CommandError(f"Falha de conexão com a API DeepSeek: {exc.reason}") from exc
+                if self._cancel_event.is_set():
+                    raise ExecutionAborted("Execução abortada pelo usuário.")
+                text = self._extract_deepseek_response_text(raw_response)
+                emitter.feed(text)
+            self._release_http_connection(pool_key, connection, response)
+            released = True
+        except (OSError, http.client.HTTPException) as exc:
+            raise CommandError(f"Falha de conexão com a API DeepSeek: {exc}") from exc
+        finally:
+            if not released:
+                # Resposta lida pela metade (erro ou cancelamento): a conexão não é reaproveitável.
+                connection.close()
 
+        emitter.flush()
         if self._cancel_event.is_set():
             raise ExecutionAborted("Execução abortada pelo usuário.")
+        return text
 
-        return self._extract_deepseek_response_text(raw_response)
-
-    def _parse_deepseek_command(self, command_tokens: list[str]) -> _DeepSeekCommandConfig:
-        if not self._is_deepseek_command_tokens(command_tokens):
-            raise CommandError("Comando DeepSeek inválido.")
-
-        model = DEFAULT_DEEPSEEK_MODEL
-        base_url = os.getenv(DEEPSEEK_API_BASE_URL_ENV_VAR, DEFAULT_DEEPSEEK_API_BASE_URL).strip()
-        temperature: float | None = None
-        max_tokens: int | None = None
-
-        index = 1
-        while index < len(command_tokens):
-            token = command_tokens[index]
-
-            if token in {"--model", "-m"}:
-                model, index = self._read_required_token_value(command_tokens, index, token)
-                continue
-            if token.startswith("--model="):
-                model = token.partition("=")[2].strip()
-                if not model:
-                    raise CommandError("Valor de --model não pode ser vazio no comando deepseek.")
-                index += 1
-                continue
-            if token in {"--temperature", "-t"}:
-                raw_value, index = self._read_required_token_value(command_tokens, index, token)
-                try:
-                    temperature = float(raw_value)
-                except ValueError as exc:
-                    raise CommandError(f"Valor inválido para {token}: {raw_value}") from exc
-                continue
-            if token.startswith("--temperature="):
-                raw_value = token.partition("=")[2].strip()
-                try:
-                    temperature = float(raw_value)
-                except ValueError as exc:
-                    raise CommandError(f"Valor inválido para --temperature: {raw_value}") from exc
-                index += 1
-                continue
-            if token == "--max-tokens":
-                raw_value, index = self._read_required_token_value(command_tokens, index, token)
-                max_tokens = self._parse_positive_int_value(raw_value, token)
+    def _read_deepseek_event_stream(self, response: http.client.HTTPResponse, emitter: "_LineEmitter") -> str:
+        """
+        Consome o stream SSE de /chat/completions até o fim do corpo, repassando o
+        conteúdo ao emitter conforme chega. Retorna o texto completo (ou o
+        raciocínio, quando o modelo não produz conteúdo).
+        """
+        content_parts: list[str] = []
+        reasoning_parts: list[str] = []
+        finished = False
+        while True:
+            if self._cancel_event.is_set():
+                raise ExecutionAborted("Execução abortada pelo usuário.")
+            raw_line = response.readline()
+            if not raw_line:
+                break
+            if finished or not raw_line.startswith(b"data:"):
+                # Linhas vazias separam eventos; comentários (":") são keep-alive do servidor.
                 continue
-            if token.startswith("--max-tokens="):
-                raw_value = token.partition("=")[2].strip()
-                max_tokens = self._parse_positive_int_value(raw_value, "--max-tokens")
-                index += 1
+            data = raw_line[5:].strip()
+            if data == b"[DONE]":
+                finished = True
                 continue
-            if token == "--base-url":
-                base_url, index = self._read_required_token_value(command_tokens, index, token)
+            try:
+                event = json_loads(data)
+            except json.JSONDecodeError as exc:
+                raise CommandError("Resposta inválida da API DeepSeek (JSON malformado).") from exc
+            if not isinstance(event, dict):
+                raise CommandError("Resposta inválida da API DeepSeek (objeto JSON esperado).")
+            if "error" in event:
+                error_message = self._extract_deepseek_error_message(data.decode("utf-8", errors="replace"))
+                raise CommandError(f"Erro retornado pela API DeepSeek: {error_message}")
+
+            choices = event.get("choices")
+            if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
                 continue
-            if token.startswith("--base-url="):
-                base_url = token.partition("=")[2].strip()
-                if not base_url:
-                    raise CommandError("Valor de --base-url não pode ser vazio no comando deepseek.")
-                index += 1
+            delta = choices[0].get("delta")
+            if not isinstance(delta, dict):
                 continue
+            content = self._extract_text_content(delta.get("content"))
+            if content:
+                content_parts.append(content)
+                emitter.feed(content)
+            reasoning = self._extract_text_content(delta.get("reasoning_content"))
+            if reasoning:
+                reasoning_parts.append(reasoning)
+
+        text = "".join(content_parts).strip()
+        if not text:
+            text = "".join(reasoning_parts).strip()
+            emitter.feed(text)
+        if not text:
+            raise CommandError("Resposta da API DeepSeek sem conteúdo de texto.")
+        return text
 
-            raise CommandError(
-                "Comando deepseek inválido. Opções suportadas: "
-                "--model/-m, --temperature/-t, --max-tokens e --base-url."
-            )
-
-        normalized_base_url = base_url.strip().rstrip("/")
-        if not normalized_base_url:
-            raise CommandError("URL base da API DeepSeek não pode ser vazia.")
-        if not model.strip():
-            raise CommandError("Modelo DeepSeek não pode ser vazio.")
-
-        return _DeepSeekCommandConfig(
-            model=model.strip(),
-            base_url=normalized_base_url,
-            temperature=temperature,
-            max_tokens=max_tokens,
-        )
+    def _open_http_response(
+        self,
+        url: str,
+        *,
+        body: bytes,
+        headers: dict[str, str],
+        timeout: int,
+    ) -> tuple[tuple[str, str, str], http.client.HTTPConnection, http.client.HTTPResponse]:
+        """
+        Faz um POST reaproveitando conexões keep-alive do mesmo host (sem novo
+        handshake TCP/TLS a cada passo) e devolve a resposta ainda não lida.
+        Uma conexão reaproveitada que o servidor já fechou é refeita uma vez.
+        HTTP_PROXY/HTTPS_PROXY/NO_PROXY são respeitados: HTTPS passa por túnel
+        CONNECT; HTTP envia a URL absoluta ao proxy.
+        Depois de ler o corpo inteiro, devolva a conexão com
+        `_release_http_connection`.
+        """
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme not in {"http", "https"} or not parts.netloc:
+            raise CommandError(f"URL inválida para a API DeepSeek: {url}")
+        proxy = _resolve_http_proxy(parts)
+        pool_key = (parts.scheme, parts.netloc, proxy.geturl() if proxy is not None else "")
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        if proxy is not None and parts.scheme == "http":
+            path = f"http://{parts.netloc}{path}"
+            headers = {**headers, **_proxy_auth_headers(proxy)}
+
+        with self._http_lock:
+            idle = self._idle_http_connections.get(pool_key)
+            connection = idle.pop() if idle else None
+        reused = connection is not None
+
+        while True:
+            if connection is None:
+                connection_class = (
+                    http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+                )
+                if proxy is None:
+                    connection = connection_class(parts.netloc, timeout=timeout)
+                else:
+                    connection = connection_class(proxy.hostname, proxy.port, timeout=timeout)
+                    if parts.scheme == "https":
+                        connection.set_tunnel(parts.hostname, parts.port, headers=_proxy_auth_headers(proxy))
+            else:
+                connection.timeout = timeout
+                if connection.sock is not None:
+                    connection.sock.settimeout(timeout)
+            try:
+                connection.request("POST", path, body=body, headers=headers)
+                return pool_key, connection, connection.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                connection.close()
+                if not reused:
+                    raise
+                connection, reused = None, False
+            except BaseException:
+                connection.close()
+                raise
 
-    def _read_required_token_value(
+    def _release_http_connection(
         self,
-        command_tokens: list[str],
-        current_index: int,
-        option_name: str,
-    ) -> tuple[str, int]:
-        next_index = current_index + 1
-        if next_index >= len(command_tokens):
-            raise CommandError(f"O comando deepseek exige valor para {option_name}.")
-        value = command_tokens[next_index].strip()
-        if not value:
-            raise CommandError(f"O comando deepseek exige valor não vazio para {option_name}.")
-        return value, next_index + 1
-
-    def _parse_positive_int_value(self, raw_value: str, option_name: str) -> int:
-        try:
-            parsed = int(raw_value)
-        except ValueError as exc:
-            raise CommandError(f"Valor inválido para {option_name}: {raw_value}") from exc
-        if parsed <= 0:
-            raise CommandError(f"{option_name} deve ser um inteiro positivo.")
-        return parsed
+        pool_key: tuple[str, str, str],
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        if response.will_close:
+            connection.close()
+            return
+        with self._http_lock:
+            idle = self._idle_http_connections.setdefault(pool_key, [])
+            if len(idle) < _MAX_IDLE_HTTP_CONNECTIONS_PER_KEY:
+                idle.append(connection)
+                return
+        connection.close()
+
+    def _parse_deepseek_command(self, command_tokens: list[str]) -> _DeepSeekCommandConfig:
+        # A URL base do ambiente entra na chave do cache: mudar a env var invalida o resultado.
+        return _parse_deepseek_options(
+            tuple(command_tokens),
+            os.getenv(DEEPSEEK_API_BASE_URL_ENV_VAR, DEFAULT_DEEPSEEK_API_BASE_URL),
+        )
 
     def _extract_deepseek_error_message(self, raw_body: str) -> str | None:
         try:
-            payload = json.loads(raw_body)
+            payload = json_loads(raw_body)
         except json.JSONDecodeError:
             return raw_body.strip() or None
         if not isinstance(payload, dict):
@@ -558,7 +1117,7 @@ class Executor:
 
     def _extract_deepseek_response_text(self, raw_response: str) -> str:
         try:
-            payload = json.loads(raw_response)
+            payload = json_loads(raw_response)
         except json.JSONDecodeError as exc:
             raise CommandError("Resposta inválida da API DeepSeek (JSON malformado).") from exc
 
@@ -589,6 +1148,9 @@ class Executor:
         return text.strip()
 
     def _extract_text_content(self, value: object) -> str:
+        # Caso comum (inclusive em cada delta do stream): content já é str.
+        if type(value) is str or value is None:
+            return value or ""
         if isinstance(value, str):
             return value
         if not isinstance(value, list):
@@ -611,32 +1173,30 @@ class Executor:
         if len(cleaned_output) <= max_chars:
             return cleaned_output, False
         truncated = cleaned_output[-max_chars:].strip()
-        return f"{OUTPUT_TRUNCATION_NOTICE}{truncated}".strip(), True
+        return _with_truncation_notice(truncated), True
 
     def _prepare_command(self, command: str, input_data: str) -> tuple[list[str], str]:
         """
         Resolve o comando final e define se o payload será enviado por stdin.
         """
-        command_tokens = shlex.split(command)
-        argv_payload = self._wrap_argv_input_payload(input_data)
+        command_tokens = list(_tokenize(command))
 
-        if "{input}" not in command:
-            if self._is_gemini_prompt_missing_value(command):
-                return [*command_tokens, argv_payload], ""
+        if INPUT_PLACEHOLDER not in command:
+            if self._is_gemini_prompt_missing_value(command_tokens):
+                return [*command_tokens, self._wrap_argv_input_payload(input_data)], ""
             return command_tokens, input_data
 
-        prepared_tokens = [token.replace("{input}", argv_payload) for token in command_tokens]
-        return prepared_tokens, ""
+        argv_payload = self._wrap_argv_input_payload(input_data)
+        # Só os tokens que contêm o placeholder são reconstruídos; os demais são reaproveitados.
+        for index, token in enumerate(command_tokens):
+            if INPUT_PLACEHOLDER in token:
+                command_tokens[index] = token.replace(INPUT_PLACEHOLDER, argv_payload)
+        return command_tokens, ""
 
-    def _is_gemini_prompt_missing_value(self, command: str) -> bool:
+    def _is_gemini_prompt_missing_value(self, tokens: Sequence[str]) -> bool:
         """
         Detecta comandos `gemini -p` / `gemini --prompt` sem valor.
         """
-        try:
-            tokens = shlex.split(command)
-        except ValueError:
-            return False
-
         if not tokens:
             return False
 
@@ -656,33 +1216,40 @@ class Executor:
         normalized_payload = payload.strip()
         if not normalized_payload:
             return ""
-        return (
-            f"{CLI_INPUT_BLOCK_START}\n"
-            "PROMPT INTEGRAL ENVIADO VIA ARGV.\n"
-            f"{normalized_payload}\n"
-            f"{CLI_INPUT_BLOCK_END}"
-        )
+        # join copia o prompt uma única vez (a + b + c criaria um intermediário do tamanho do prompt).
+        return "".join((_ARGV_PAYLOAD_PREFIX, normalized_payload, _ARGV_PAYLOAD_SUFFIX))
 
     def _terminate_process(self, process: subprocess.Popen) -> None:
         if process.poll() is not None:
             return
 
-        if os.name != "nt":
-            try:
-                os.killpg(process.pid, signal.SIGTERM)
-            except ProcessLookupError:
-                return
-            except OSError:
-                process.terminate()
-        else:
+        if os.name == "nt":
             process.terminate()
+            try:
+                process.wait(timeout=TERMINATE_GRACE_PERIOD_SECONDS)
+            except subprocess.TimeoutExpired:
+                process.kill()
+            return
+
+        # O filho lidera o próprio grupo (pgid == pid): sinalizar o grupo alcança
+        # também os processos auxiliares que a CLI tenha criado.
+        if not self._signal_process_group(process, signal.SIGTERM):
+            return
         try:
-            process.wait(timeout=1)
+            process.wait(timeout=TERMINATE_GRACE_PERIOD_SECONDS)
         except subprocess.TimeoutExpired:
-            if os.name != "nt":
-                try:
-                    os.killpg(process.pid, signal.SIGKILL)
-                except (ProcessLookupError, OSError):
-                    process.kill()
-            else:
-                process.kill()
+            self._signal_process_group(process, signal.SIGKILL)
+
+    def _request_terminate(self, process: subprocess.Popen) -> None:
+        """Envia o pedido de encerramento (SIGTERM no grupo) e retorna sem esperar."""
+        if os.name == "nt":
+            process.terminate()
+            return
+        self._signal_process_group(process, signal.SIGTERM)
+
+    def _signal_process_group(self, process: subprocess.Popen, signal_number: int) -> bool:
+        try:
+            os.killpg(process.pid, signal_number)
+        except ProcessLookupError:
+            return False
+        return True
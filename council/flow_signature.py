@@ -1,14 +1,20 @@
 from __future__ import annotations
 
 import base64
+import functools
 import json
+import mmap
 import os
-import re
-import tempfile
+import secrets
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Sequence
 
+from council.json_codec import dumps_bytes as json_dumps_bytes
+from council.json_codec import loads as json_loads
 from council.paths import get_council_home
 
 
@@ -19,7 +25,12 @@ FLOW_TRUSTED_KEYS_DIR_ENV_VAR = "COUNCIL_TRUSTED_FLOW_KEYS_DIR"
 
 _TRUTHY_ENV_VALUES = {"1", "true", "yes", "on"}
 _FALSY_ENV_VALUES = {"", "0", "false", "no", "off"}
-_KEY_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+_ED25519_SIGNATURE_SIZE = 64
+_ED25519_SIGNATURE_B64_LENGTH = 88  # base64 de 64 bytes, com "==" de padding
+_KEY_ID_MAX_LENGTH = 64
+# key_id: 1-64 chars ASCII, primeiro alfanumérico, demais alfanuméricos ou '.', '_', '-'.
+_KEY_ID_HEAD_BYTES = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789"
+_KEY_ID_ALLOWED_BYTES = _KEY_ID_HEAD_BYTES + b"._-"
 
 
 class FlowSignatureError(Exception):
@@ -83,21 +94,43 @@ def trust_flow_public_key(
     *,
     overwrite: bool = False,
 ) -> Path:
-    source_path = public_key_path.expanduser()
-    if not source_path.exists() or not source_path.is_file():
-        raise FlowSignatureError(f"Arquivo de chave pública não encontrado: '{source_path}'.")
-
     normalized_key_id = normalize_key_id(key_id)
-    destination = get_trusted_flow_keys_dir(create=True) / f"{normalized_key_id}.pem"
-    if destination.exists() and not overwrite:
-        raise FlowSignatureError(
-            f"A chave '{normalized_key_id}' já existe em '{destination}'. Use --overwrite para substituir."
-        )
+    return _trust_public_key_into(
+        get_trusted_flow_keys_dir(create=True),
+        public_key_path,
+        normalized_key_id,
+        overwrite=overwrite,
+    )
 
-    key_bytes = _read_file_bytes(source_path, label="chave pública")
-    _load_public_key(key_bytes=key_bytes, key_path=source_path)
-    _secure_write_bytes(destination, key_bytes, mode=0o600)
-    return destination
+
+def trust_flow_public_keys(
+    items: Sequence[tuple[Path, str]],
+    *,
+    overwrite: bool = False,
+) -> list[Path]:
+    """
+    Confia várias chaves públicas (`(public_key_path, key_id)`) de uma vez.
+
+    O diretório de chaves confiadas é criado e protegido uma única vez e as
+    gravações rodam em paralelo. Retorna os destinos na ordem de `items`; a
+    primeira falha nessa ordem é relançada, mas as demais chaves podem já ter
+    sido gravadas.
+    """
+    normalized_items = [(public_key_path, normalize_key_id(key_id)) for public_key_path, key_id in items]
+    seen_key_ids: set[str] = set()
+    for _, normalized_key_id in normalized_items:
+        if normalized_key_id in seen_key_ids:
+            raise FlowSignatureError(f"key_id repetido na mesma operação: '{normalized_key_id}'.")
+        seen_key_ids.add(normalized_key_id)
+    if not normalized_items:
+        return []
+
+    trusted_dir = get_trusted_flow_keys_dir(create=True)
+    return _map_in_threads(
+        lambda item: _trust_public_key_into(trusted_dir, item[0], item[1], overwrite=overwrite),
+        normalized_items,
+        thread_name_prefix="council-flow-trust",
+    )
 
 
 def generate_flow_signing_keypair(
@@ -143,20 +176,65 @@ def sign_flow_file(
 ) -> Path:
     target_flow = flow_path.expanduser()
     _ensure_regular_file(target_flow, label="flow.json")
+    private_key = _read_private_key_file(private_key_path)
+    return _sign_flow_file_with_key(
+        target_flow,
+        private_key,
+        normalize_key_id(key_id),
+        signature_path=signature_path,
+        overwrite=overwrite,
+    )
+
+
+def sign_flow_files(
+    flow_paths: Sequence[Path],
+    private_key_path: Path,
+    key_id: str,
+    *,
+    overwrite: bool = False,
+) -> list[Path]:
+    """
+    Assina vários fluxos com a mesma chave, em paralelo.
+
+    Cada fluxo segue as regras de `sign_flow_file` (assinatura em `<flow>.sig`) e
+    a chave privada é carregada uma vez só, para esta chamada. Retorna os caminhos
+    das assinaturas na ordem de `flow_paths`; a primeira falha nessa ordem é
+    relançada, mas as assinaturas dos demais fluxos podem já ter sido gravadas.
+    """
+    private_key = _read_private_key_file(private_key_path)
+    normalized_key_id = normalize_key_id(key_id)
+
+    def _sign_one(flow_path: Path) -> Path:
+        target_flow = flow_path.expanduser()
+        _ensure_regular_file(target_flow, label="flow.json")
+        return _sign_flow_file_with_key(target_flow, private_key, normalized_key_id, overwrite=overwrite)
+
+    return _map_in_threads(_sign_one, flow_paths, thread_name_prefix="council-flow-sign")
+
+
+def _read_private_key_file(private_key_path: Path) -> Any:
     target_private_key = private_key_path.expanduser()
     _ensure_regular_file(target_private_key, label="chave privada")
+    private_key_bytes = _read_file_bytes(target_private_key, label="chave privada")
+    return _load_private_key(key_bytes=private_key_bytes, key_path=target_private_key)
 
+
+def _sign_flow_file_with_key(
+    target_flow: Path,
+    private_key: Any,
+    normalized_key_id: str,
+    *,
+    signature_path: Path | None = None,
+    overwrite: bool = False,
+) -> Path:
     output_signature_path = get_signature_file_path(target_flow, signature_path)
     if output_signature_path.exists() and not overwrite:
         raise FlowSignatureError(
             f"O arquivo de assinatura já existe: '{output_signature_path}'. Use --overwrite para substituir."
         )
 
-    normalized_key_id = normalize_key_id(key_id)
-    flow_content = _read_file_bytes(target_flow, label="flow.json")
-    private_key_bytes = _read_file_bytes(target_private_key, label="chave privada")
-    private_key = _load_private_key(key_bytes=private_key_bytes, key_path=target_private_key)
-    signature = private_key.sign(flow_content)
+    with _mapped_file_bytes(target_flow, label="flow.json") as flow_content:
+        signature = private_key.sign(flow_content)
 
     payload = {
         "version": FLOW_SIGNATURE_VERSION,
@@ -164,7 +242,7 @@ def sign_flow_file(
         "key_id": normalized_key_id,
         "signature": base64.b64encode(signature).decode("ascii"),
     }
-    serialized_payload = json.dumps(payload, ensure_ascii=False, indent=2).encode("utf-8")
+    serialized_payload = json_dumps_bytes(payload, indent=True)
     _secure_write_bytes(output_signature_path, serialized_payload, mode=0o600)
     return output_signature_path
 
@@ -181,7 +259,8 @@ def verify_flow_signature(
     target_flow = flow_path.expanduser()
     _ensure_regular_file(target_flow, label="flow.json")
     target_signature_path = get_signature_file_path(target_flow, signature_path)
-    if not target_signature_path.exists():
+    signature_stat = _lstat_if_exists(target_signature_path, label="assinatura")
+    if signature_stat is None:
         if require_signature:
             raise FlowSignatureVerificationError(
                 (
@@ -190,44 +269,176 @@ def verify_flow_signature(
                 )
             )
         return False
-    _ensure_regular_file(target_signature_path, label="assinatura")
+    signature_stat = _ensure_regular_file(target_signature_path, label="assinatura", path_stat=signature_stat)
 
-    metadata = load_signature_metadata(target_signature_path)
+    metadata = _load_signature_metadata(target_signature_path, signature_stat)
     signature_bytes = _decode_signature_bytes(metadata.signature_b64)
 
-    if flow_content is None:
-        flow_content = _read_file_bytes(target_flow, label="flow.json")
-
-    verification_public_key_path = _resolve_public_key_path(
+    verification_public_key_path, public_key_stat = _resolve_public_key_path(
         key_id=metadata.key_id,
         explicit_public_key_path=public_key_path,
         trusted_keys_dir=trusted_keys_dir,
     )
-    public_key_bytes = _read_file_bytes(verification_public_key_path, label="chave pública")
-    public_key = _load_public_key(
-        key_bytes=public_key_bytes,
-        key_path=verification_public_key_path,
-    )
+    public_key = _load_public_key_file(verification_public_key_path, public_key_stat)
 
-    InvalidSignature, _, _, _ = _load_crypto_primitives()
-    try:
-        public_key.verify(signature_bytes, flow_content)
-    except InvalidSignature as exc:
+    if flow_content is not None:
+        is_valid = _verify_ed25519(public_key, signature_bytes, flow_content)
+    else:
+        with _mapped_file_bytes(target_flow, label="flow.json") as mapped_flow_content:
+            is_valid = _verify_ed25519(public_key, signature_bytes, mapped_flow_content)
+    if not is_valid:
         raise FlowSignatureVerificationError(
             (
                 f"Assinatura inválida para '{target_flow}' "
                 f"(key_id='{metadata.key_id}', assinatura='{target_signature_path}')."
             )
-        ) from exc
+        )
+
+    return True
+
+
+def verify_flow_signature_bytes(
+    flow_content: bytes,
+    signature: FlowSignatureMetadata | bytes,
+    public_key: Any = None,
+    *,
+    trusted_keys_dir: Path | None = None,
+) -> bool:
+    """
+    Verifica conteúdo já em memória sem ler fluxo nem assinatura do disco.
+
+    `signature` é um `FlowSignatureMetadata` já carregado ou os 64 bytes crus da
+    assinatura. `public_key` pode ser a chave já carregada, o PEM em bytes ou um
+    `key_id` (resolvido no diretório de chaves confiadas, com cache); se omitido,
+    usa o `key_id` dos metadados. Levanta `FlowSignatureVerificationError` quando a
+    assinatura não confere.
+    """
+    if isinstance(signature, FlowSignatureMetadata):
+        key_id: str | None = signature.key_id
+        signature_bytes = _decode_signature_bytes(signature.signature_b64)
+    else:
+        key_id = None
+        signature_bytes = bytes(signature)
+        if len(signature_bytes) != _ED25519_SIGNATURE_SIZE:
+            raise FlowSignatureError("Assinatura inválida: esperado assinatura Ed25519 de 64 bytes.")
+
+    if public_key is None or isinstance(public_key, str):
+        key_id = normalize_key_id(public_key) if public_key is not None else key_id
+        if key_id is None:
+            raise FlowSignatureError("Informe a chave pública ou um key_id para verificar assinatura crua.")
+        key_path, key_stat = _resolve_public_key_path(
+            key_id=key_id,
+            explicit_public_key_path=None,
+            trusted_keys_dir=trusted_keys_dir,
+        )
+        public_key = _load_public_key_file(key_path, key_stat)
+    elif isinstance(public_key, (bytes, bytearray)):
+        public_key = _load_public_key_pem_cached(bytes(public_key))
 
+    if not _verify_ed25519(public_key, signature_bytes, flow_content):
+        key_hint = f" (key_id='{key_id}')" if key_id else ""
+        raise FlowSignatureVerificationError(f"Assinatura inválida para o conteúdo informado{key_hint}.")
+    return True
+
+
+def verify_flow_signatures_batch(
+    items: Sequence[tuple[Path, Path | None, Path | None]],
+    *,
+    require_signature: bool = False,
+    trusted_keys_dir: Path | None = None,
+) -> list[bool]:
+    """
+    Verifica vários fluxos; cada item é `(flow_path, signature_path, public_key_path)`.
+
+    Cada item (leitura de arquivos e verificação Ed25519) roda numa thread: a
+    `cryptography` libera o GIL durante a verificação e as chaves públicas
+    repetidas saem do cache de chaves. Retorna um booleano por item, na ordem de
+    `items`; a primeira falha nessa ordem é relançada.
+    """
+    return _map_in_threads(
+        lambda item: verify_flow_signature(
+            item[0],
+            signature_path=item[1],
+            public_key_path=item[2],
+            require_signature=require_signature,
+            trusted_keys_dir=trusted_keys_dir,
+        ),
+        items,
+        thread_name_prefix="council-flow-verify",
+    )
+
+
+def _trust_public_key_into(
+    trusted_dir: Path,
+    public_key_path: Path,
+    normalized_key_id: str,
+    *,
+    overwrite: bool,
+) -> Path:
+    source_path = public_key_path.expanduser()
+    if not source_path.exists() or not source_path.is_file():
+        raise FlowSignatureError(f"Arquivo de chave pública não encontrado: '{source_path}'.")
+
+    destination = trusted_dir / f"{normalized_key_id}.pem"
+    if destination.exists() and not overwrite:
+        raise FlowSignatureError(
+            f"A chave '{normalized_key_id}' já existe em '{destination}'. Use --overwrite para substituir."
+        )
+
+    key_bytes = _read_file_bytes(source_path, label="chave pública")
+    _load_public_key(key_bytes=key_bytes, key_path=source_path)
+    # get_trusted_flow_keys_dir(create=True) já criou e protegeu o diretório.
+    _write_bytes_atomically(destination, key_bytes, mode=0o600)
+    return destination
+
+
+def _map_in_threads(function: Any, items: Sequence[Any], *, thread_name_prefix: str) -> list[Any]:
+    if not items:
+        return []
+    max_workers = min(len(items), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix) as pool:
+        # `map` relança a primeira exceção na ordem de entrada.
+        return list(pool.map(function, items))
+
+
+def _verify_ed25519(public_key: Any, signature_bytes: bytes, flow_content: Any) -> bool:
+    InvalidSignature, _, _, _ = _load_crypto_primitives()
+    try:
+        public_key.verify(signature_bytes, flow_content)
+    except InvalidSignature:
+        return False
     return True
 
 
 def load_signature_metadata(signature_path: Path) -> FlowSignatureMetadata:
+    try:
+        signature_stat = os.stat(signature_path)
+    except OSError as exc:
+        raise FlowSignatureError(f"Falha ao ler assinatura em '{signature_path}': {exc}") from exc
+    return _load_signature_metadata(signature_path, signature_stat)
+
+
+def _load_signature_metadata(signature_path: Path, signature_stat: os.stat_result) -> FlowSignatureMetadata:
+    return _parse_signature_metadata_cached(
+        str(signature_path),
+        _file_cache_key(signature_stat),
+        FLOW_SIGNATURE_VERSION,
+    )
+
+
+# A versão suportada entra na chave: mudar FLOW_SIGNATURE_VERSION descarta entradas antigas.
+@functools.lru_cache(maxsize=256)
+def _parse_signature_metadata_cached(
+    path_str: str,
+    file_key: tuple[int, int, int, int],
+    supported_version: int,
+) -> FlowSignatureMetadata:
+    del file_key, supported_version
+    signature_path = Path(path_str)
     payload_bytes = _read_file_bytes(signature_path, label="assinatura")
     try:
-        payload = json.loads(payload_bytes.decode("utf-8"))
-    except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+        payload = json_loads(payload_bytes)
+    except json.JSONDecodeError as exc:
         raise FlowSignatureError(
             f"Arquivo de assinatura inválido em '{signature_path}': esperado JSON UTF-8."
         ) from exc
@@ -272,7 +483,7 @@ def load_signature_metadata(signature_path: Path) -> FlowSignatureMetadata:
 
 def normalize_key_id(raw_key_id: str) -> str:
     key_id = raw_key_id.strip()
-    if not _KEY_ID_PATTERN.fullmatch(key_id):
+    if not _is_valid_key_id(key_id):
         raise FlowSignatureError(
             (
                 f"key_id inválido: '{raw_key_id}'. "
@@ -282,46 +493,85 @@ def normalize_key_id(raw_key_id: str) -> str:
     return key_id
 
 
+def _is_valid_key_id(key_id: str) -> bool:
+    if not key_id or len(key_id) > _KEY_ID_MAX_LENGTH or not key_id.isascii():
+        return False
+    encoded = key_id.encode("ascii")
+    # translate(None, delete=...) sobra apenas com os bytes fora do conjunto permitido.
+    return encoded[0] in _KEY_ID_HEAD_BYTES and not encoded.translate(None, _KEY_ID_ALLOWED_BYTES)
+
+
 def _resolve_public_key_path(
     *,
     key_id: str,
     explicit_public_key_path: Path | None,
     trusted_keys_dir: Path | None,
-) -> Path:
+) -> tuple[Path, os.stat_result]:
     if explicit_public_key_path is not None:
         key_path = explicit_public_key_path.expanduser()
-        _ensure_regular_file(key_path, label="chave pública")
-        return key_path
+        return key_path, _ensure_regular_file(key_path, label="chave pública")
 
     trusted_dir = trusted_keys_dir.expanduser() if trusted_keys_dir is not None else get_trusted_flow_keys_dir()
     trusted_key_path = trusted_dir / f"{key_id}.pem"
-    if not trusted_key_path.exists():
+    trusted_key_stat = _lstat_if_exists(trusted_key_path, label="chave pública")
+    if trusted_key_stat is None:
         raise FlowSignatureVerificationError(
             (
                 f"Chave pública não confiada para key_id='{key_id}'. "
                 f"Esperado arquivo '{trusted_key_path}'. Use 'council flow trust'."
             )
         )
-    _ensure_regular_file(trusted_key_path, label="chave pública")
-    return trusted_key_path
+    return trusted_key_path, _ensure_regular_file(
+        trusted_key_path,
+        label="chave pública",
+        path_stat=trusted_key_stat,
+    )
 
 
 def _decode_signature_bytes(signature_b64: str) -> bytes:
+    # Comprimento fixo: descarta lixo antes de decodificar.
+    if len(signature_b64) != _ED25519_SIGNATURE_B64_LENGTH:
+        raise FlowSignatureError(
+            "Campo 'signature' inválido: esperado assinatura Ed25519 de 64 bytes em base64."
+        )
     try:
-        return base64.b64decode(signature_b64.encode("ascii"), validate=True)
+        signature_bytes = base64.b64decode(signature_b64.encode("ascii"), validate=True)
     except (UnicodeEncodeError, ValueError) as exc:
         raise FlowSignatureError("Campo 'signature' inválido: esperado base64 válido.") from exc
+    if len(signature_bytes) != _ED25519_SIGNATURE_SIZE:
+        raise FlowSignatureError(
+            "Campo 'signature' inválido: esperado assinatura Ed25519 de 64 bytes em base64."
+        )
+    return signature_bytes
 
 
-def _ensure_regular_file(path: Path, *, label: str) -> None:
-    if not path.exists():
+def _ensure_regular_file(
+    path: Path,
+    *,
+    label: str,
+    path_stat: os.stat_result | None = None,
+) -> os.stat_result:
+    """Valida com um único lstat (ou o já obtido em `path_stat`) e devolve o resultado."""
+    if path_stat is None:
+        path_stat = _lstat_if_exists(path, label=label)
+    if path_stat is None:
         raise FlowSignatureError(f"Arquivo de {label} não encontrado: '{path}'.")
-    if path.is_symlink():
+    if stat.S_ISLNK(path_stat.st_mode):
         raise FlowSignatureError(
             f"O caminho de {label} não pode ser link simbólico: '{path}'."
         )
-    if not path.is_file():
+    if not stat.S_ISREG(path_stat.st_mode):
         raise FlowSignatureError(f"O caminho de {label} não é um arquivo: '{path}'.")
+    return path_stat
+
+
+def _lstat_if_exists(path: Path, *, label: str) -> os.stat_result | None:
+    try:
+        return os.lstat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except OSError as exc:
+        raise FlowSignatureError(f"Falha ao ler {label} em '{path}': {exc}") from exc
 
 
 def _read_file_bytes(path: Path, *, label: str) -> bytes:
@@ -331,29 +581,59 @@ def _read_file_bytes(path: Path, *, label: str) -> bytes:
         raise FlowSignatureError(f"Falha ao ler {label} em '{path}': {exc}") from exc
 
 
+@contextmanager
+def _mapped_file_bytes(path: Path, *, label: str) -> Iterator[Any]:
+    """Expõe o arquivo via mmap somente leitura, sem copiá-lo para um `bytes`."""
+    try:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    except OSError as exc:
+        raise FlowSignatureError(f"Falha ao ler {label} em '{path}': {exc}") from exc
+    try:
+        # mmap não aceita arquivo vazio; nesse caso o conteúdo é simplesmente b"".
+        mapped = mmap.mmap(fd, 0, access=mmap.ACCESS_READ) if os.fstat(fd).st_size else None
+    except (OSError, ValueError) as exc:
+        raise FlowSignatureError(f"Falha ao ler {label} em '{path}': {exc}") from exc
+    finally:
+        os.close(fd)
+
+    if mapped is None:
+        yield b""
+        return
+    try:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mapped.madvise(mmap.MADV_SEQUENTIAL)
+        yield mapped
+    finally:
+        mapped.close()
+
+
 def _secure_write_bytes(path: Path, payload: bytes, *, mode: int) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
     _harden_permissions(path.parent, mode=0o700)
+    _write_bytes_atomically(path, payload, mode=mode)
 
-    temp_path: str | None = None
+
+def _write_bytes_atomically(path: Path, payload: bytes, *, mode: int) -> None:
+    """Grava via temporário irmão + os.replace; o diretório pai já deve existir."""
+    temp_path = path.with_name(f".{path.name}.{os.getpid()}.{secrets.token_hex(4)}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_CLOEXEC", 0) | getattr(os, "O_BINARY", 0)
+    created = False
     try:
-        with tempfile.NamedTemporaryFile(
-            mode="wb",
-            prefix=f".{path.name}.",
-            suffix=".tmp",
-            dir=str(path.parent),
-            delete=False,
-        ) as temp_file:
+        fd = os.open(temp_path, flags, mode)
+        created = True
+        try:
             if hasattr(os, "fchmod"):
-                os.fchmod(temp_file.fileno(), mode)
-            temp_file.write(payload)
-            temp_path = temp_file.name
-
-        os.chmod(temp_path, mode)
+                # O modo de O_CREAT passa pela umask; fchmod garante exatamente `mode`.
+                os.fchmod(fd, mode)
+            pending = memoryview(payload)
+            while pending:
+                pending = pending[os.write(fd, pending) :]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(temp_path, path)
-        os.chmod(path, mode)
     except OSError as exc:
-        if temp_path:
+        if created:
             try:
                 os.unlink(temp_path)
             except OSError:
@@ -369,6 +649,34 @@ def _harden_permissions(path: Path, *, mode: int) -> None:
         return
 
 
+def _load_public_key_file(key_path: Path, key_stat: os.stat_result) -> Any:
+    return _load_public_key_cached(os.path.abspath(key_path), _file_cache_key(key_stat))
+
+
+def _file_cache_key(file_stat: os.stat_result) -> tuple[int, int, int, int]:
+    """Identidade do conteúdo para os caches por arquivo.
+
+    O inode entra porque as gravações deste módulo usam os.replace: um arquivo
+    regravado no mesmo tick de mtime e com o mesmo tamanho (chaves PEM e
+    assinaturas têm tamanho fixo) ainda muda de inode.
+    """
+    return (file_stat.st_dev, file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+# file_key entra só na chave do cache: alterar o arquivo invalida a entrada.
+@functools.lru_cache(maxsize=128)
+def _load_public_key_cached(path_str: str, file_key: tuple[int, int, int, int]) -> Any:
+    del file_key
+    key_path = Path(path_str)
+    key_bytes = _read_file_bytes(key_path, label="chave pública")
+    return _load_public_key(key_bytes=key_bytes, key_path=key_path)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_public_key_pem_cached(key_bytes: bytes) -> Any:
+    return _load_public_key(key_bytes=key_bytes, key_path=Path("<memória>"))
+
+
 def _load_private_key(*, key_bytes: bytes, key_path: Path) -> Any:
     _, serialization, Ed25519PrivateKey, _ = _load_crypto_primitives()
     try:
@@ -397,6 +705,8 @@ def _load_public_key(*, key_bytes: bytes, key_path: Path) -> Any:
     return key
 
 
+# Importa uma vez; a falha (cryptography ausente) não é memorizada e volta a ser levantada.
+@functools.lru_cache(maxsize=1)
 def _load_crypto_primitives() -> tuple[Any, Any, Any, Any]:
     try:
         from cryptography.exceptions import InvalidSignature
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - depende do ambiente
+    orjson = None
+
+
+def dumps(value: Any, *, sort_keys: bool = False) -> str:
+    """Serializa em JSON compacto usando orjson quando disponível.
+
+    Sem orjson (ou para valores que ele não suporta, como inteiros acima de
+    64 bits), cai para o `json` da stdlib no mesmo formato.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else 0
+        try:
+            return orjson.dumps(value, option=option).decode("utf-8")
+        except TypeError:
+            pass
+    return _stdlib_dumps_bytes(value, sort_keys=sort_keys).decode("utf-8")
+
+
+def dumps_bytes(value: Any, *, indent: bool = False) -> bytes:
+    """Serializa em JSON já codificado em UTF-8 (corpo de requisições HTTP).
+
+    Compacto por padrão; com `indent=True`, usa indentação de 2 espaços
+    (arquivos lidos por pessoas, como assinaturas de fluxo).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            pass
+    return _stdlib_dumps_bytes(value, indent=indent)
+
+
+def dumps_line(value: Any) -> bytes:
+    """Serializa em JSON compacto já codificado em UTF-8 e terminado em `\n`.
+
+    Pensado para escrita direta em arquivos binários (um objeto por linha).
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass
+    return _stdlib_dumps_bytes(value) + b"\n"
+
+
+def _stdlib_dumps_bytes(value: Any, *, sort_keys: bool = False, indent: bool = False) -> bytes:
+    """Fallback com a saída do orjson: sem espaços extras e UTF-8 sem escapes."""
+    options: dict[str, Any] = {
+        "sort_keys": sort_keys,
+        "indent": 2 if indent else None,
+        "separators": (",", ": ") if indent else (",", ":"),
+    }
+    try:
+        return json.dumps(value, ensure_ascii=False, **options).encode("utf-8")
+    except UnicodeEncodeError:
+        # Surrogates isolados (que o orjson também rejeita) não têm UTF-8: saem como \uXXXX.
+        return json.dumps(value, ensure_ascii=True, **options).encode("ascii")
+
+
+def loads(data: bytes | str) -> Any:
+    """Desserializa JSON (bytes em UTF-8 ou str) usando orjson quando disponível.
+
+    Erros de sintaxe e de codificação são sempre levantados como
+    `json.JSONDecodeError` (orjson.JSONDecodeError é subclasse dele).
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, bytes):
+        try:
+            data = data.decode("utf-8")
+        except UnicodeDecodeError as exc:
+            raise json.JSONDecodeError(f"conteúdo não é UTF-8 válido ({exc.reason})", "", exc.start) from exc
+    return json.loads(data)
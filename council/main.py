@@ -995,7 +995,10 @@ def run(
         flow_config_path=str(resolved_config.path) if resolved_config.path is not None else None,
         flow_config_source=resolved_config.source,
     )
-    orchestrator.run_flow(prompt)
+    try:
+        orchestrator.run_flow(prompt)
+    finally:
+        executor.close()
 
 
 @app.command()
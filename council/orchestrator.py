@@ -237,6 +237,7 @@ class Orchestrator:
                     on_output=update_cb,
                     max_input_chars=max_input_chars,
                     max_output_chars=max_output_chars,
+                    on_output_batched=True,
                 )
 
             if is_code:
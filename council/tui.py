@@ -1120,6 +1120,7 @@ class CouncilTextualApp(App[None]):
             self._feedback_event.set()
             with self._executor_lock:
                 self._active_executor = None
+            executor.close()
             self._dispatch_ui(self._set_running, False)
 
 
@@ -29,7 +29,8 @@ class UI:
         content_lines = []
         
         def update_content(new_text: str):
-            content_lines.append(new_text)
+            # O executor pode entregar várias linhas por chamada (on_output_batched).
+            content_lines.extend(new_text.splitlines() or [""])
             # Mantém apenas as últimas N linhas para não estourar o limite de altura
             visible_lines = content_lines[-(max_height - 2):]
             renderable = "\n".join(visible_lines)
@@ -3,6 +3,10 @@ import logging
 import os
 import stat
 import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from enum import IntEnum
 from pathlib import Path
 
 import pytest
@@ -114,7 +118,7 @@ def test_audit_log_falls_back_to_null_handler_when_council_home_is_unavailable(
     audit_log_module.log_event(logger, "audit.test.nullhandler", level=logging.INFO)
 
 
-def test_audit_log_reapplies_file_permissions_on_each_write(
+def test_audit_log_reapplies_file_permissions_when_reopening_log(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     council_home = tmp_path / ".council-home"
@@ -128,10 +132,54 @@ def test_audit_log_reapplies_file_permissions_on_each_write(
     os.chmod(log_path, 0o666)
     assert stat.S_IMODE(log_path.stat().st_mode) == 0o666
 
+    audit_log_module._reset_audit_logger_for_tests()
+    logger = audit_log_module.get_audit_logger()
     audit_log_module.log_event(logger, "audit.test.second", level=logging.INFO)
     _flush_logger(logger)
 
     assert stat.S_IMODE(log_path.stat().st_mode) == 0o600
+    assert len(_read_log_entries(log_path)) == 2
+
+
+def test_audit_log_does_not_fchmod_on_every_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    council_home = tmp_path / ".council-home"
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(council_home))
+    logger = audit_log_module.get_audit_logger()
+
+    fchmod_calls: list[int] = []
+    original_fchmod = os.fchmod
+    monkeypatch.setattr(
+        audit_log_module.os,
+        "fchmod",
+        lambda fd, mode: (fchmod_calls.append(fd), original_fchmod(fd, mode)),
+    )
+    for index in range(10):
+        audit_log_module.log_event(logger, "audit.test.write", level=logging.INFO, index=index)
+    _flush_logger(logger)
+
+    assert fchmod_calls == []
+
+
+def test_audit_log_skips_permission_hardening_on_non_posix(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    council_home = tmp_path / ".council-home"
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(council_home))
+    monkeypatch.setattr(audit_log_module, "_IS_POSIX", False)
+    chmod_calls: list[object] = []
+    monkeypatch.setattr(audit_log_module.os, "chmod", lambda *args: chmod_calls.append(args))
+
+    logger = audit_log_module.get_audit_logger()
+    audit_log_module.log_event(logger, "audit.test.non_posix", level=logging.INFO)
+    _flush_logger(logger)
+
+    (buffered_handler,) = logger.handlers[0].listener.handlers
+    assert type(buffered_handler.target) is audit_log_module._BinaryRotatingFileHandler
+    assert chmod_calls == []
+    entries = _read_log_entries(council_home / audit_log_module.COUNCIL_LOG_FILE_NAME)
+    assert entries[0]["event"] == "audit.test.non_posix"
 
 
 def test_audit_log_rotates_when_file_exceeds_max_size(
@@ -155,6 +203,8 @@ def test_audit_log_rotates_when_file_exceeds_max_size(
 
     rotated_file = council_home / f"{audit_log_module.COUNCIL_LOG_FILE_NAME}.1"
     assert rotated_file.exists()
+    log_path = council_home / audit_log_module.COUNCIL_LOG_FILE_NAME
+    assert stat.S_IMODE(log_path.stat().st_mode) == 0o600
 
 
 def test_reset_audit_logger_for_tests_is_thread_safe(
@@ -197,3 +247,207 @@ def test_reset_audit_logger_for_tests_is_thread_safe(
 
     log_path = council_home / audit_log_module.COUNCIL_LOG_FILE_NAME
     assert log_path.exists()
+
+
+def test_audit_json_formatter_timestamp_matches_record_creation_time() -> None:
+    formatter = audit_log_module._AuditJsonFormatter()
+    first = logging.LogRecord("council.audit", logging.INFO, __file__, 1, "first", None, None)
+    second = logging.LogRecord("council.audit", logging.INFO, __file__, 1, "second", None, None)
+    first.created = 1_700_000_000.25
+    second.created = 1_700_000_000.5
+
+    first_entry = json.loads(formatter.format(first))
+    second_entry = json.loads(formatter.format(second))
+
+    assert first_entry["timestamp_utc"] == "2023-11-14T22:13:20.250000+00:00"
+    assert second_entry["timestamp_utc"] == "2023-11-14T22:13:20.500000+00:00"
+    parsed = datetime.fromisoformat(second_entry["timestamp_utc"])
+    assert parsed == datetime.fromtimestamp(second.created, timezone.utc)
+
+
+def test_audit_log_writes_through_background_queue_listener(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    council_home = tmp_path / ".council-home"
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(council_home))
+
+    logger = audit_log_module.get_audit_logger()
+    assert [type(handler) for handler in logger.handlers] == [audit_log_module._AuditQueueHandler]
+
+    try:
+        raise RuntimeError("falha simulada")
+    except RuntimeError:
+        logger.error("audit.test.exception", exc_info=True, extra={"audit_event": "audit.test.exception"})
+    _flush_logger(logger)
+
+    entries = _read_log_entries(council_home / audit_log_module.COUNCIL_LOG_FILE_NAME)
+    assert entries[-1]["event"] == "audit.test.exception"
+    assert "RuntimeError: falha simulada" in entries[-1]["exception"]
+
+
+def test_reset_audit_logger_for_tests_stops_queue_listener_threads(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+    baseline_threads = threading.active_count()
+
+    for _ in range(5):
+        audit_log_module.get_audit_logger()
+        audit_log_module._reset_audit_logger_for_tests()
+
+    assert threading.active_count() == baseline_threads
+
+
+class _CollectingHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+def _make_record(level: int, message: str) -> logging.LogRecord:
+    return logging.LogRecord("council.audit", level, __file__, 1, message, None, None)
+
+
+def test_buffered_audit_handler_flushes_on_capacity_and_error_level() -> None:
+    target = _CollectingHandler()
+    handler = audit_log_module._BufferedAuditHandler(target, capacity=3, flush_interval_seconds=3600)
+    try:
+        handler.handle(_make_record(logging.INFO, "first"))
+        handler.handle(_make_record(logging.INFO, "second"))
+        assert target.records == []
+
+        handler.handle(_make_record(logging.ERROR, "failure"))
+        assert [record.getMessage() for record in target.records] == ["first", "second", "failure"]
+    finally:
+        handler.close()
+
+
+def test_buffered_audit_handler_flushes_periodically_when_idle() -> None:
+    target = _CollectingHandler()
+    handler = audit_log_module._BufferedAuditHandler(target, capacity=100, flush_interval_seconds=0.01)
+    try:
+        handler.handle(_make_record(logging.INFO, "idle"))
+        deadline = time.monotonic() + 2
+        while not target.records and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert [record.getMessage() for record in target.records] == ["idle"]
+    finally:
+        handler.close()
+
+
+@pytest.mark.parametrize(
+    "env_var",
+    [
+        audit_log_module.COUNCIL_LOG_BUFFER_CAPACITY_ENV_VAR,
+        audit_log_module.COUNCIL_LOG_FLUSH_INTERVAL_MS_ENV_VAR,
+    ],
+)
+def test_audit_log_rejects_invalid_buffering_env(
+    monkeypatch: pytest.MonkeyPatch, env_var: str
+) -> None:
+    monkeypatch.setenv(env_var, "0")
+
+    with pytest.raises(ValueError, match=env_var):
+        audit_log_module.get_audit_logger()
+
+
+def test_sanitize_log_value_handles_exact_types_and_subclasses() -> None:
+    class Mode(IntEnum):
+        FAST = 1
+
+    long_text = "x" * (audit_log_module.MAX_FIELD_LENGTH + 10)
+    sanitized = audit_log_module._sanitize_log_value(
+        {
+            "flag": True,
+            "ratio": 0.5,
+            "path": Path("/tmp/flow.json"),
+            "long": long_text,
+            "items": ("a", 1),
+            "nested": OrderedDict(mode=Mode.FAST),
+            "other": object,
+        }
+    )
+
+    assert sanitized["flag"] is True
+    assert sanitized["ratio"] == 0.5
+    assert sanitized["path"] == "/tmp/flow.json"
+    assert sanitized["long"].endswith("...[truncated]")
+    assert len(sanitized["long"]) == audit_log_module.MAX_FIELD_LENGTH + len("...[truncated]")
+    assert sanitized["items"] == ["a", 1]
+    assert sanitized["nested"] == {"mode": Mode.FAST}
+    assert sanitized["other"] == str(object)
+
+
+def test_log_event_skips_sanitizing_events_below_configured_level(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+    monkeypatch.setenv(audit_log_module.COUNCIL_LOG_LEVEL_ENV_VAR, "WARNING")
+    logger = audit_log_module.get_audit_logger()
+
+    def sanitize_should_not_run(value: object) -> object:
+        raise AssertionError("Eventos abaixo do nível configurado não devem ser sanitizados.")
+
+    monkeypatch.setattr(audit_log_module, "_sanitize_log_value", sanitize_should_not_run)
+
+    audit_log_module.log_event(logger, "audit.test.info", level=logging.INFO, detail="ignorado")
+
+    assert logger.isEnabledFor(logging.INFO) is False
+    assert logger.isEnabledFor(logging.WARNING) is True
+
+
+def test_log_event_drops_none_values_and_handles_events_without_data(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    council_home = tmp_path / ".council-home"
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(council_home))
+
+    logger = audit_log_module.get_audit_logger()
+    audit_log_module.log_event(logger, "audit.test.empty", level=logging.INFO)
+    audit_log_module.log_event(logger, "audit.test.partial", level=logging.INFO, kept=1, dropped=None)
+    _flush_logger(logger)
+
+    entries = _read_log_entries(council_home / audit_log_module.COUNCIL_LOG_FILE_NAME)
+    assert [entry["data"] for entry in entries] == [{}, {"kept": 1}]
+    assert audit_log_module._EMPTY_AUDIT_DATA == {}
+
+
+def test_sanitize_log_value_truncates_strings_only_above_limit() -> None:
+    limit = audit_log_module.MAX_FIELD_LENGTH
+    at_limit = "a" * limit
+
+    assert audit_log_module._sanitize_log_value(at_limit) is at_limit
+    assert audit_log_module._sanitize_log_value(at_limit + "b") == audit_log_module._truncate_string(at_limit + "b")
+
+
+def test_get_audit_logger_installs_a_single_handler(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+
+    audit_log_module.get_audit_logger()
+    logger = audit_log_module.get_audit_logger()
+
+    assert len(logging.getLogger(audit_log_module.LOGGER_NAME).handlers) == 1
+    assert logger is logging.getLogger(audit_log_module.LOGGER_NAME)
+
+
+def test_binary_rotating_file_handler_writes_utf8_lines_without_text_layer(tmp_path: Path) -> None:
+    log_path = tmp_path / "audit.log"
+    handler = audit_log_module._BinaryRotatingFileHandler(log_path, maxBytes=0, backupCount=1)
+    handler.setFormatter(audit_log_module._AuditJsonFormatter())
+    try:
+        record = _make_record(logging.INFO, "audit.test.binary")
+        record.audit_data = {"texto": "ação"}
+        handler.emit(record)
+        handler.emit(_make_record(logging.INFO, "audit.test.binary.second"))
+        assert "b" in handler.stream.mode
+    finally:
+        handler.close()
+
+    entries = _read_log_entries(log_path)
+    assert [entry["event"] for entry in entries] == ["audit.test.binary", "audit.test.binary.second"]
+    assert entries[0]["data"] == {"texto": "ação"}
@@ -1,5 +1,6 @@
 import json
 import shlex
+import sys
 from pathlib import Path
 
 import pytest
@@ -23,6 +24,9 @@ def mock_command_lookup(monkeypatch: pytest.MonkeyPatch) -> None:
     }
 
     monkeypatch.setattr("council.config.shutil.which", lambda binary: known_bins.get(binary))
+    config_module._reset_config_caches_for_tests()
+    yield
+    config_module._reset_config_caches_for_tests()
 
 
 def _step_payload(key: str = "step_1", **overrides: object) -> dict[str, object]:
@@ -83,6 +87,35 @@ def test_resolve_flow_config_marks_cwd_source(
     assert resolved.source == config_module.FLOW_CONFIG_SOURCE_CWD
 
 
+def test_resolve_flow_config_reports_missing_file_and_directory(tmp_path: Path) -> None:
+    with pytest.raises(ConfigError, match="não encontrado"):
+        resolve_flow_config(str(tmp_path / "missing.json"))
+    with pytest.raises(ConfigError, match="não encontrado"):
+        resolve_flow_config(str(tmp_path / "missing" / "flow.json"))
+    with pytest.raises(ConfigError, match="não é um arquivo"):
+        resolve_flow_config(str(tmp_path))
+
+
+def test_resolve_flow_config_reports_symlink_loop_as_missing(tmp_path: Path) -> None:
+    (tmp_path / "a").symlink_to(tmp_path / "b")
+    (tmp_path / "b").symlink_to(tmp_path / "a")
+
+    with pytest.raises(ConfigError, match="não encontrado"):
+        resolve_flow_config(str(tmp_path / "a"))
+
+
+def test_resolve_flow_config_wraps_other_os_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    def _denied_stat(self, *args, **kwargs):
+        raise PermissionError(13, "Permission denied")
+
+    monkeypatch.setattr(config_module.Path, "stat", _denied_stat)
+
+    with pytest.raises(ConfigError, match="Falha ao acessar arquivo de configuração"):
+        resolve_flow_config(str(tmp_path / "flow.json"))
+
+
 def test_load_flow_steps_reads_flow_json_from_cwd(
     isolated_config_env: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -138,6 +171,14 @@ def test_load_flow_steps_raises_on_invalid_json(tmp_path: Path) -> None:
         load_flow_steps(str(bad_file))
 
 
+def test_load_flow_steps_raises_on_non_utf8_content(tmp_path: Path) -> None:
+    bad_file = tmp_path / "flow.json"
+    bad_file.write_bytes(b'[{"key": "\xff"}]')
+
+    with pytest.raises(ConfigError, match="JSON inválido"):
+        load_flow_steps(str(bad_file))
+
+
 def test_load_flow_steps_rejects_unsigned_flow_when_signature_is_required(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -329,12 +370,50 @@ def test_load_flow_steps_raises_on_disallowed_shell_operators(
     assert operator in str(exc_info.value)
 
 
-def test_load_flow_steps_raises_on_unknown_command_binary(tmp_path: Path) -> None:
+def test_validate_command_skips_operator_regex_without_trigger_chars(monkeypatch: pytest.MonkeyPatch) -> None:
+    class _FailingPattern:
+        def finditer(self, command: str):
+            raise AssertionError("regex should not run for commands without trigger chars.")
+
+    monkeypatch.setattr(config_module, "_DISALLOWED_COMMAND_PATTERN", _FailingPattern())
+
+    config_module._validate_command_syntax("codex exec --skip-git-repo-check", step=1)
+
+
+def test_disallowed_command_trigger_chars_cover_every_pattern() -> None:
+    for pattern, label in config_module.DISALLOWED_COMMAND_PATTERNS:
+        sample = {"$VAR": "$HOME", "~": "~/x"}.get(label, label.replace("\\n", "\n").replace("\\r", "\r"))
+        assert pattern.search(sample), label
+        assert not config_module._DISALLOWED_COMMAND_TRIGGER_CHARS.isdisjoint(sample), label
+
+
+def test_validate_command_reports_every_disallowed_operator_in_declaration_order() -> None:
+    with pytest.raises(ConfigError) as exc_info:
+        config_module._validate_command_syntax("codex exec\n~/tmp > out >> log | cat", step=1)
+
+    assert "(\\n, |, ~, >>, >)" in str(exc_info.value)
+
+
+def test_load_flow_steps_does_not_look_up_binaries_in_path(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
     path = tmp_path / "flow.json"
-    _write_json(path, [_step_payload(command="missing_binary --flag")])
+    _write_json(path, [_step_payload(command="codex exec")])
 
-    with pytest.raises(ConfigError, match="binário inexistente no PATH"):
-        load_flow_steps(str(path))
+    def which_should_not_run(binary: str) -> str | None:
+        raise AssertionError("shutil.which should not run while parsing flow.json.")
+
+    monkeypatch.setattr("council.config.shutil.which", which_should_not_run)
+
+    assert [step.command for step in load_flow_steps(str(path))] == ["codex exec"]
+
+
+def test_validate_command_binary_rejects_binary_missing_from_path() -> None:
+    with pytest.raises(ConfigError, match="binário inexistente no PATH: 'ollama_missing'"):
+        config_module.validate_command_binary("ollama_missing")
+
+    config_module.validate_command_binary("codex")
+    config_module.validate_command_binary("deepseek")
 
 
 def test_load_flow_steps_accepts_deepseek_api_provider_without_local_binary(tmp_path: Path) -> None:
@@ -459,7 +538,8 @@ def test_load_flow_steps_raises_on_invalid_command_syntax(tmp_path: Path) -> Non
 
 def test_default_flow_commands_follow_validation_rules() -> None:
     for index, step in enumerate(config_module.get_default_flow_steps(), start=1):
-        config_module._validate_command(step.command, step=index)
+        config_module._validate_command_syntax(step.command, step=index)
+        config_module.validate_command_binary(shlex.split(step.command)[0])
 
 
 def test_render_step_input_raises_for_missing_template_variable() -> None:
@@ -474,3 +554,181 @@ def test_render_step_input_raises_for_missing_template_variable() -> None:
 
     with pytest.raises(ConfigError, match="missing_field"):
         render_step_input(step, {"instruction": "Revise", "full_context": "ctx"})
+
+
+def test_render_step_input_reuses_parsed_template_fields() -> None:
+    config_module._template_field_names.cache_clear()
+    step = FlowStep(
+        key="review",
+        agent_name="Gemini",
+        role_desc="Revisao",
+        command="gemini -p {input}",
+        instruction="Revise",
+        input_template="{instruction}: {plan} / {plan}",
+    )
+
+    first = render_step_input(step, {"instruction": "Revise", "plan": "P"})
+    second = render_step_input(step, {"instruction": "Revise", "plan": "Q"})
+
+    assert (first, second) == ("Revise: P / P", "Revise: Q / Q")
+    assert config_module._template_field_names(step.input_template) == ("instruction", "plan")
+    assert config_module._template_field_names.cache_info().misses == 1
+
+
+def test_which_lookup_is_cached_per_binary_and_path(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    calls: list[str] = []
+
+    def fake_which(binary: str) -> str | None:
+        calls.append(binary)
+        return "/usr/local/bin/codex" if binary == "codex" else None
+
+    monkeypatch.setattr("council.config.shutil.which", fake_which)
+    monkeypatch.setenv("PATH", "/usr/local/bin")
+
+    for _ in range(3):
+        assert config_module._which_cached("codex") == "/usr/local/bin/codex"
+        assert config_module._which_cached("claude") is None
+    assert calls == ["codex", "claude", "claude", "claude"]
+
+    monkeypatch.setenv("PATH", "/opt/bin")
+    config_module._which_cached("codex")
+    assert calls[-1] == "codex"
+
+
+def test_load_flow_steps_reuses_parsed_steps_for_unchanged_content(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    path = tmp_path / "flow.json"
+    _write_json(path, [_step_payload(key="plan")])
+    parse_calls: list[int] = []
+    verify_calls: list[Path] = []
+    original_parse_step = config_module._parse_step
+    original_verify = config_module.verify_flow_signature
+
+    def counting_parse_step(raw_step, position):
+        parse_calls.append(position)
+        return original_parse_step(raw_step, position)
+
+    def counting_verify(flow_path, **kwargs):
+        verify_calls.append(flow_path)
+        return original_verify(flow_path, **kwargs)
+
+    monkeypatch.setattr(config_module, "_parse_step", counting_parse_step)
+    monkeypatch.setattr(config_module, "verify_flow_signature", counting_verify)
+
+    first = load_flow_steps(str(path))
+    second = load_flow_steps(str(path))
+    assert first == second
+    assert first is not second
+    assert parse_calls == [1]
+    assert len(verify_calls) == 2
+
+    _write_json(path, [_step_payload(key="plan"), _step_payload(key="review")])
+    third = load_flow_steps(str(path))
+    assert [step.key for step in third] == ["plan", "review"]
+    assert parse_calls == [1, 1, 2]
+
+
+def test_find_duplicate_keys_reports_each_repeated_key_once() -> None:
+    assert config_module._find_duplicate_keys(["plan", "code", "review"]) == set()
+    assert config_module._find_duplicate_keys(["plan", "code", "plan", "code", "plan"]) == {"plan", "code"}
+
+
+def test_get_default_flow_steps_returns_fresh_list_over_cached_steps() -> None:
+    first = config_module.get_default_flow_steps()
+    first.clear()
+    second = config_module.get_default_flow_steps()
+
+    assert [step.key for step in second] == ["plan", "critique", "final_plan", "code", "review"]
+    assert second[0] is config_module.get_default_flow_steps()[0]
+
+
+@pytest.mark.parametrize(
+    "command",
+    [
+        "claude -p",
+        "  codex   exec\t--skip-git-repo-check  ",
+        "gemini -p {input}",
+        "deepseek --model=deepseek-chat # comentario",
+        "claude --append-system-prompt 'seja breve'",
+        'gemini -p "{input}"',
+        "codex exec a\\ b",
+        "codex exec\x0bbinario",
+        "ollama run modelo-ç",
+        "",
+    ],
+)
+def test_split_command_matches_shlex_split(command: str) -> None:
+    expected_tokens = shlex.split(command)
+
+    assert config_module._split_command(command) == expected_tokens
+    assert config_module._command_binary(command) == (expected_tokens[0] if expected_tokens else None)
+
+
+def test_split_command_propagates_shlex_syntax_errors() -> None:
+    with pytest.raises(ValueError):
+        config_module._split_command("claude -p 'sem fechamento")
+    with pytest.raises(ValueError):
+        config_module._command_binary("claude -p 'sem fechamento")
+
+
+def test_load_flow_steps_interns_step_keys(tmp_path: Path) -> None:
+    path = tmp_path / "flow.json"
+    path.write_bytes(b'[{"key": "plan_custom", "agent": "A", "role": "R", "command": "codex exec", "instruction": "I"}]')
+
+    steps = load_flow_steps(str(path))
+
+    assert steps[0].key is sys.intern("plan_custom")
+    assert isinstance(config_module.RESERVED_TEMPLATE_KEYS, frozenset)
+
+
+def test_validate_flow_template_references_reports_first_missing_variable_sorted() -> None:
+    step = FlowStep(
+        key="review",
+        agent_name="Gemini",
+        role_desc="Revisao",
+        command="gemini -p {input}",
+        instruction="Revise",
+        input_template="{zeta} {user_prompt} {alpha}",
+    )
+
+    with pytest.raises(ConfigError, match="variável inexistente 'alpha'"):
+        config_module.validate_flow_template_references([step])
+
+
+def test_flow_step_uses_slots() -> None:
+    step = config_module.get_default_flow_steps()[0]
+
+    assert not hasattr(step, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "input_template",
+    [
+        "{instruction}\n\n{full_context}",
+        "Plano: {plan} {{literal}} fim",
+        "{plan!r} e {plan:>5}",
+        "{data[item]} / {plan}",
+        "sem campos",
+    ],
+)
+def test_render_step_input_matches_format_map(input_template: str) -> None:
+    step = FlowStep(
+        key="review",
+        agent_name="Gemini",
+        role_desc="Revisao",
+        command="gemini -p {input}",
+        instruction="Revise",
+        input_template=input_template,
+    )
+    context = {"instruction": "Revise", "full_context": "ctx", "plan": "P", "data": {"item": "I"}}
+
+    assert render_step_input(step, context) == input_template.format_map(context)
+
+
+def test_compiled_template_falls_back_for_complex_fields() -> None:
+    assert config_module._compiled_template("A {plan} B") == (("A ", "plan"), (" B", None))
+    assert config_module._compiled_template("{plan!r}") is None
+    assert config_module._compiled_template("{data[item]}") is None
@@ -1,3 +1,5 @@
+import base64
+import hashlib
 import json
 from pathlib import Path
 
@@ -13,8 +15,12 @@ from council.flow_signature import (
     normalize_key_id,
     parse_signature_required_from_env,
     sign_flow_file,
+    sign_flow_files,
     trust_flow_public_key,
+    trust_flow_public_keys,
     verify_flow_signature,
+    verify_flow_signature_bytes,
+    verify_flow_signatures_batch,
 )
 from council.paths import COUNCIL_HOME_ENV_VAR
 
@@ -23,6 +29,11 @@ class _FakeInvalidSignature(Exception):
     pass
 
 
+def _fake_signature(secret: bytes, payload: bytes) -> bytes:
+    # 64 bytes, como uma assinatura Ed25519 real.
+    return hashlib.sha512(secret + b":" + payload).digest()
+
+
 class _FakeEd25519PrivateKey:
     _PEM_PREFIX = b"FAKE-PRIVATE:"
 
@@ -34,7 +45,7 @@ class _FakeEd25519PrivateKey:
         return cls(b"generated-secret")
 
     def sign(self, payload: bytes) -> bytes:
-        return b"sig:" + self.secret + b":" + payload
+        return _fake_signature(self.secret, payload)
 
     def public_key(self) -> "_FakeEd25519PublicKey":
         return _FakeEd25519PublicKey(self.secret)
@@ -51,7 +62,7 @@ class _FakeEd25519PublicKey:
         self.secret = secret
 
     def verify(self, signature: bytes, payload: bytes) -> None:
-        expected = b"sig:" + self.secret + b":" + payload
+        expected = _fake_signature(self.secret, payload)
         if signature != expected:
             raise _FakeInvalidSignature("invalid signature")
 
@@ -92,6 +103,9 @@ class _FakeSerialization:
 
 @pytest.fixture
 def fake_crypto(monkeypatch: pytest.MonkeyPatch) -> None:
+    signature_module._load_public_key_cached.cache_clear()
+    signature_module._load_public_key_pem_cached.cache_clear()
+    signature_module._parse_signature_metadata_cached.cache_clear()
     monkeypatch.setattr(
         signature_module,
         "_load_crypto_primitives",
@@ -121,6 +135,15 @@ def _write_minimal_flow(path: Path) -> None:
     )
 
 
+def test_load_crypto_primitives_is_memoized() -> None:
+    pytest.importorskip("cryptography")
+
+    first = signature_module._load_crypto_primitives()
+
+    assert signature_module._load_crypto_primitives() is first
+    assert first[3].__name__ == "Ed25519PublicKey"
+
+
 def test_parse_signature_required_from_env(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv(FLOW_SIGNATURE_REQUIRED_ENV_VAR, "true")
     assert parse_signature_required_from_env() is True
@@ -174,6 +197,166 @@ def test_sign_and_verify_flow_signature_roundtrip(
     assert verify_flow_signature(flow_path, require_signature=True) is True
 
 
+def test_verify_flow_signatures_batch_loads_shared_key_once(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_crypto: None,
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+    private_key_path = tmp_path / "author.key.pem"
+    public_key_path = tmp_path / "author.pub.pem"
+    generate_flow_signing_keypair(private_key_path, public_key_path)
+    trust_flow_public_key(public_key_path, "author-v1")
+
+    flow_paths = []
+    for index in range(3):
+        flow_path = tmp_path / f"flow-{index}.json"
+        _write_minimal_flow(flow_path)
+        flow_paths.append(flow_path)
+    sign_flow_file(flow_paths[0], private_key_path, "author-v1")
+    sign_flow_file(flow_paths[1], private_key_path, "author-v1")
+
+    loaded_keys: list[bytes] = []
+    original_loader = _FakeSerialization.load_pem_public_key
+
+    def _counting_loader(value: bytes):
+        loaded_keys.append(value)
+        return original_loader(value)
+
+    monkeypatch.setattr(_FakeSerialization, "load_pem_public_key", staticmethod(_counting_loader))
+
+    results = verify_flow_signatures_batch([(flow_path, None, None) for flow_path in flow_paths])
+
+    assert results == [True, True, False]
+    assert len(loaded_keys) == 1
+
+
+def test_sign_flow_files_signs_every_flow_in_order(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_crypto: None,
+) -> None:
+    private_key_path = tmp_path / "author.key.pem"
+    public_key_path = tmp_path / "author.pub.pem"
+    generate_flow_signing_keypair(private_key_path, public_key_path)
+    flow_paths = []
+    for index in range(4):
+        flow_path = tmp_path / f"flow-{index}.json"
+        _write_minimal_flow(flow_path)
+        flow_paths.append(flow_path)
+    loaded_private_keys: list[bytes] = []
+    original_loader = _FakeSerialization.load_pem_private_key
+
+    def _counting_loader(value: bytes, password=None):
+        loaded_private_keys.append(value)
+        return original_loader(value, password=password)
+
+    monkeypatch.setattr(_FakeSerialization, "load_pem_private_key", staticmethod(_counting_loader))
+
+    signature_paths = sign_flow_files(flow_paths, private_key_path, "author-v1")
+
+    assert len(loaded_private_keys) == 1
+    assert not hasattr(signature_module, "_load_private_key_cached")
+    assert signature_paths == [tmp_path / f"flow-{index}.json.sig" for index in range(4)]
+    assert verify_flow_signatures_batch(
+        [(flow_path, None, public_key_path) for flow_path in flow_paths],
+        require_signature=True,
+    ) == [True] * 4
+    assert sign_flow_files([], private_key_path, "author-v1") == []
+
+
+def test_verify_flow_signatures_batch_raises_first_invalid_item(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_crypto: None,
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+    private_key_path = tmp_path / "author.key.pem"
+    public_key_path = tmp_path / "author.pub.pem"
+    generate_flow_signing_keypair(private_key_path, public_key_path)
+
+    valid_flow = tmp_path / "valid.json"
+    tampered_flow = tmp_path / "tampered.json"
+    for flow_path in (valid_flow, tampered_flow):
+        _write_minimal_flow(flow_path)
+        sign_flow_file(flow_path, private_key_path, "author-v1")
+    tampered_flow.write_text(tampered_flow.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+
+    with pytest.raises(FlowSignatureVerificationError, match="tampered.json"):
+        verify_flow_signatures_batch(
+            [
+                (valid_flow, None, public_key_path),
+                (tampered_flow, None, public_key_path),
+            ],
+            require_signature=True,
+        )
+
+
+def test_public_key_cache_is_invalidated_when_file_changes(
+    tmp_path: Path,
+    fake_crypto: None,
+) -> None:
+    public_key_path = tmp_path / "author.pub.pem"
+    public_key_path.write_bytes(b"FAKE-PUBLIC:first")
+
+    first = signature_module._load_public_key_file(public_key_path, public_key_path.stat())
+    assert signature_module._load_public_key_file(public_key_path, public_key_path.stat()) is first
+
+    public_key_path.write_bytes(b"FAKE-PUBLIC:second-key")
+    second = signature_module._load_public_key_file(public_key_path, public_key_path.stat())
+
+    assert second is not first
+    assert second.secret == b"second-key"
+
+
+def test_mapped_file_bytes_exposes_content_and_handles_empty_files(tmp_path: Path) -> None:
+    flow_path = tmp_path / "flow.json"
+    flow_path.write_bytes(b"[]")
+    empty_path = tmp_path / "empty.json"
+    empty_path.write_bytes(b"")
+
+    with signature_module._mapped_file_bytes(flow_path, label="flow.json") as content:
+        assert bytes(content) == b"[]"
+    with signature_module._mapped_file_bytes(empty_path, label="flow.json") as content:
+        assert content == b""
+    with pytest.raises(FlowSignatureError, match="Falha ao ler flow.json"):
+        with signature_module._mapped_file_bytes(tmp_path / "missing.json", label="flow.json"):
+            pass
+
+
+def test_verify_flow_signature_bytes_accepts_metadata_raw_bytes_and_key_forms(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_crypto: None,
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+    flow_path = tmp_path / "flow.json"
+    _write_minimal_flow(flow_path)
+    private_key_path = tmp_path / "author.key.pem"
+    public_key_path = tmp_path / "author.pub.pem"
+    generate_flow_signing_keypair(private_key_path, public_key_path)
+    trust_flow_public_key(public_key_path, "author-v1")
+    signature_path = sign_flow_file(flow_path, private_key_path, "author-v1")
+
+    flow_content = flow_path.read_bytes()
+    metadata = load_signature_metadata(signature_path)
+    raw_signature = base64.b64decode(metadata.signature_b64)
+    public_key_pem = public_key_path.read_bytes()
+
+    assert verify_flow_signature_bytes(flow_content, metadata) is True
+    assert verify_flow_signature_bytes(flow_content, raw_signature, "author-v1") is True
+    assert verify_flow_signature_bytes(flow_content, raw_signature, public_key_pem) is True
+    assert verify_flow_signature_bytes(
+        flow_content, raw_signature, _FakeSerialization.load_pem_public_key(public_key_pem)
+    ) is True
+    with pytest.raises(FlowSignatureVerificationError, match="key_id='author-v1'"):
+        verify_flow_signature_bytes(flow_content + b"\n", metadata)
+    with pytest.raises(FlowSignatureError, match="Informe a chave pública"):
+        verify_flow_signature_bytes(flow_content, raw_signature)
+    with pytest.raises(FlowSignatureError, match="64 bytes"):
+        verify_flow_signature_bytes(flow_content, raw_signature[:-1], public_key_pem)
+
+
 def test_verify_requires_signature_when_enabled(
     tmp_path: Path,
     fake_crypto: None,
@@ -224,6 +407,43 @@ def test_trust_flow_public_key_rejects_existing_key_without_overwrite(
         trust_flow_public_key(public_key_path, "author-v1")
 
 
+def test_trust_flow_public_keys_hardens_dir_once_and_writes_all_keys(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    fake_crypto: None,
+) -> None:
+    monkeypatch.setenv(COUNCIL_HOME_ENV_VAR, str(tmp_path / ".council-home"))
+    items = []
+    for index in range(3):
+        public_key_path = tmp_path / f"team-{index}.pub.pem"
+        public_key_path.write_bytes(f"FAKE-PUBLIC:team-{index}".encode("ascii"))
+        items.append((public_key_path, f"team-{index}"))
+    harden_calls: list[Path] = []
+    original_harden = signature_module._harden_permissions
+
+    def _recording_harden(path: Path, *, mode: int) -> None:
+        harden_calls.append(path)
+        original_harden(path, mode=mode)
+
+    monkeypatch.setattr(signature_module, "_harden_permissions", _recording_harden)
+
+    destinations = trust_flow_public_keys(items)
+
+    assert [destination.name for destination in destinations] == ["team-0.pem", "team-1.pem", "team-2.pem"]
+    assert [destination.read_bytes() for destination in destinations] == [
+        public_key_path.read_bytes() for public_key_path, _ in items
+    ]
+    assert harden_calls == [destinations[0].parent]
+
+
+def test_trust_flow_public_keys_rejects_repeated_key_id(tmp_path: Path, fake_crypto: None) -> None:
+    public_key_path = tmp_path / "author.pub.pem"
+    public_key_path.write_bytes(b"FAKE-PUBLIC:author")
+
+    with pytest.raises(FlowSignatureError, match="key_id repetido"):
+        trust_flow_public_keys([(public_key_path, "author-v1"), (public_key_path, " author-v1 ")])
+
+
 def test_generate_flow_signing_keypair_rejects_existing_files_without_overwrite(
     tmp_path: Path,
     fake_crypto: None,
@@ -237,15 +457,44 @@ def test_generate_flow_signing_keypair_rejects_existing_files_without_overwrite(
         generate_flow_signing_keypair(private_key_path, public_key_path, overwrite=False)
 
 
-@pytest.mark.parametrize("value", ["", ".invalid", "inv alid", "inv/valid", "ç"])
+@pytest.mark.parametrize(
+    "value",
+    ["", ".invalid", "inv alid", "inv/valid", "ç", "açb", "a\x00", "a" * 65, "_a", "ª1"],
+)
 def test_normalize_key_id_rejects_invalid_values(value: str) -> None:
     with pytest.raises(FlowSignatureError, match="key_id inválido"):
         normalize_key_id(value)
 
 
-def test_load_signature_metadata_rejects_malformed_json(tmp_path: Path) -> None:
+@pytest.mark.parametrize("value", ["a", "9", "author-v1", "Team_Key.2026", "a" * 64, "  padded  "])
+def test_normalize_key_id_accepts_valid_values(value: str) -> None:
+    assert normalize_key_id(value) == value.strip()
+
+
+def test_load_signature_metadata_is_cached_until_file_is_replaced(tmp_path: Path) -> None:
     signature_path = tmp_path / "flow.json.sig"
-    signature_path.write_text("{not-json", encoding="utf-8")
+    signature_b64 = base64.b64encode(bytes(64)).decode("ascii")
+
+    def _write_signature(key_id: str) -> None:
+        payload = {"version": 1, "algorithm": "ed25519", "key_id": key_id, "signature": signature_b64}
+        signature_module._write_bytes_atomically(signature_path, json.dumps(payload).encode("utf-8"), mode=0o600)
+
+    _write_signature("author-a")
+    first = load_signature_metadata(signature_path)
+    assert load_signature_metadata(signature_path) is first
+
+    # Mesmo tamanho e mesmo mtime: só o inode (os.replace) distingue o novo conteúdo.
+    first_stat = signature_path.stat()
+    _write_signature("author-b")
+    signature_module.os.utime(signature_path, ns=(first_stat.st_atime_ns, first_stat.st_mtime_ns))
+
+    assert load_signature_metadata(signature_path).key_id == "author-b"
+
+
+@pytest.mark.parametrize("payload", [b"{not-json", b'{"key_id": "\xff"}'])
+def test_load_signature_metadata_rejects_malformed_json(tmp_path: Path, payload: bytes) -> None:
+    signature_path = tmp_path / "flow.json.sig"
+    signature_path.write_bytes(payload)
 
     with pytest.raises(FlowSignatureError, match="esperado JSON UTF-8"):
         load_signature_metadata(signature_path)
@@ -266,23 +515,71 @@ def test_secure_write_bytes_wraps_os_errors(
     tmp_path: Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
     target_path = tmp_path / "target.txt"
+    monkeypatch.setattr(signature_module.secrets, "token_hex", lambda _size: "fixed")
+    colliding_temp = tmp_path / f".target.txt.{signature_module.os.getpid()}.fixed.tmp"
+    colliding_temp.write_bytes(b"other writer")
+
+    with pytest.raises(FlowSignatureError, match="Falha ao gravar arquivo seguro"):
+        signature_module._secure_write_bytes(target_path, b"x", mode=0o600)
 
-    class _BrokenTempFile:
-        def __enter__(self):
-            raise OSError("permission denied")
+    assert colliding_temp.read_bytes() == b"other writer"
+    assert not target_path.exists()
 
-        def __exit__(self, exc_type, exc, tb):
-            del exc_type, exc, tb
-            return False
 
-    monkeypatch.setattr(
-        signature_module.tempfile,
-        "NamedTemporaryFile",
-        lambda **_kwargs: _BrokenTempFile(),
-    )
+def test_secure_write_bytes_replaces_target_with_restricted_mode(tmp_path: Path) -> None:
+    target_path = tmp_path / "nested" / "target.txt"
+    target_path.parent.mkdir()
+    target_path.write_bytes(b"old")
+    target_path.chmod(0o644)
 
-    with pytest.raises(FlowSignatureError, match="Falha ao gravar arquivo seguro"):
-        signature_module._secure_write_bytes(target_path, b"x", mode=0o600)
+    signature_module._secure_write_bytes(target_path, b"new", mode=0o600)
+
+    assert target_path.read_bytes() == b"new"
+    assert target_path.stat().st_mode & 0o777 == 0o600
+    assert [entry.name for entry in target_path.parent.iterdir()] == ["target.txt"]
+
+
+@pytest.mark.parametrize(
+    ("signature_b64", "message"),
+    [
+        (base64.b64encode(b"x" * 63).decode("ascii"), "64 bytes"),
+        ("A" * 86 + "!=", "base64 válido"),
+        ("A" * 87 + "é", "base64 válido"),
+        ("A" * 88, "64 bytes"),
+    ],
+)
+def test_decode_signature_bytes_rejects_wrong_shape(signature_b64: str, message: str) -> None:
+    with pytest.raises(FlowSignatureError, match=message):
+        signature_module._decode_signature_bytes(signature_b64)
+
+
+def test_decode_signature_bytes_accepts_ed25519_sized_signature() -> None:
+    raw_signature = bytes(range(64))
+
+    assert signature_module._decode_signature_bytes(base64.b64encode(raw_signature).decode("ascii")) == raw_signature
+
+
+def test_ensure_regular_file_uses_a_single_lstat(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    flow_path = tmp_path / "flow.json"
+    _write_minimal_flow(flow_path)
+    lstat_calls: list[object] = []
+    original_lstat = signature_module.os.lstat
+
+    def _counting_lstat(path):
+        lstat_calls.append(path)
+        return original_lstat(path)
+
+    monkeypatch.setattr(signature_module.os, "lstat", _counting_lstat)
+
+    path_stat = signature_module._ensure_regular_file(flow_path, label="flow.json")
+
+    assert lstat_calls == [flow_path]
+    assert path_stat.st_size == flow_path.stat().st_size
+    with pytest.raises(FlowSignatureError, match="não encontrado"):
+        signature_module._ensure_regular_file(tmp_path / "missing.json", label="flow.json")
 
 
 def test_verify_rejects_signature_directory(tmp_path: Path) -> None:
@@ -0,0 +1,122 @@
+import json
+
+import pytest
+
+import council.json_codec as json_codec_module
+
+
+def test_dumps_produces_compact_json_that_roundtrips() -> None:
+    payload = {"event": "audit.test", "data": {"count": 2, "items": ["a", "b"]}}
+
+    serialized = json_codec_module.dumps(payload)
+
+    assert "\n" not in serialized
+    assert json.loads(serialized) == payload
+
+
+def test_dumps_sorts_keys_when_requested() -> None:
+    serialized = json_codec_module.dumps({"b": 1, "a": 2}, sort_keys=True)
+
+    assert serialized.index('"a"') < serialized.index('"b"')
+
+
+def test_dumps_falls_back_to_stdlib_without_orjson(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(json_codec_module, "orjson", None)
+
+    serialized = json_codec_module.dumps({"texto": "ação"})
+
+    assert serialized == '{"texto":"ação"}'
+
+
+def test_stdlib_fallback_matches_orjson_byte_for_byte(monkeypatch: pytest.MonkeyPatch) -> None:
+    pytest.importorskip("orjson")
+    payload = {"event": "audit.test", "data": {"texto": "ação", "itens": [1, 2.5, None, True]}}
+    with_orjson = (
+        json_codec_module.dumps(payload, sort_keys=True),
+        json_codec_module.dumps_bytes(payload),
+        json_codec_module.dumps_bytes(payload, indent=True),
+        json_codec_module.dumps_line(payload),
+    )
+
+    monkeypatch.setattr(json_codec_module, "orjson", None)
+    without_orjson = (
+        json_codec_module.dumps(payload, sort_keys=True),
+        json_codec_module.dumps_bytes(payload),
+        json_codec_module.dumps_bytes(payload, indent=True),
+        json_codec_module.dumps_line(payload),
+    )
+
+    assert without_orjson == with_orjson
+
+
+def test_dumps_escapes_lone_surrogates_instead_of_failing() -> None:
+    line = json_codec_module.dumps_line({"texto": "a\udc80b"})
+
+    assert line == b'{"texto":"a\\udc80b"}\n'
+
+
+def test_dumps_falls_back_to_stdlib_for_values_orjson_rejects() -> None:
+    payload = {"big": 2**70}
+
+    assert json.loads(json_codec_module.dumps(payload)) == payload
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_loads_accepts_utf8_bytes_and_str(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec_module, "orjson", None)
+
+    assert json_codec_module.loads('{"texto": "ação"}'.encode("utf-8")) == {"texto": "ação"}
+    assert json_codec_module.loads('[1, "a"]') == [1, "a"]
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+@pytest.mark.parametrize("payload", [b"{invalid", b"\xff\xfe"])
+def test_loads_raises_json_decode_error_for_invalid_input(
+    monkeypatch: pytest.MonkeyPatch, use_orjson: bool, payload: bytes
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec_module, "orjson", None)
+
+    with pytest.raises(json.JSONDecodeError):
+        json_codec_module.loads(payload)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_bytes_returns_compact_utf8_json(monkeypatch: pytest.MonkeyPatch, use_orjson: bool) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec_module, "orjson", None)
+    payload = {"messages": [{"role": "user", "content": "ação"}], "temperature": 0.5}
+
+    serialized = json_codec_module.dumps_bytes(payload)
+
+    assert isinstance(serialized, bytes)
+    assert b"\n" not in serialized
+    assert json.loads(serialized.decode("utf-8")) == payload
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_bytes_indents_like_stdlib_when_requested(
+    monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec_module, "orjson", None)
+    payload = {"version": 1, "key_id": "author-v1", "signature": "c2ln"}
+
+    serialized = json_codec_module.dumps_bytes(payload, indent=True)
+
+    assert serialized == json.dumps(payload, indent=2).encode("ascii")
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_dumps_line_returns_utf8_bytes_terminated_by_newline(
+    monkeypatch: pytest.MonkeyPatch, use_orjson: bool
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(json_codec_module, "orjson", None)
+
+    line = json_codec_module.dumps_line({"texto": "ação", "n": 1})
+
+    assert isinstance(line, bytes)
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line.decode("utf-8")) == {"texto": "ação", "n": 1}
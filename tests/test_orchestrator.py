@@ -19,6 +19,7 @@ class DummyExecutor:
         on_output=None,
         max_input_chars: int | None = None,
         max_output_chars: int | None = None,
+        on_output_batched: bool = False,
     ) -> str:
         self.calls.append(
             {
@@ -27,6 +28,7 @@ class DummyExecutor:
                 "timeout": timeout,
                 "max_input_chars": max_input_chars,
                 "max_output_chars": max_output_chars,
+                "on_output_batched": on_output_batched,
             }
         )
         if on_output:
@@ -150,6 +152,7 @@ def test_orchestrator_forwards_runtime_limits_to_executor() -> None:
     assert call["timeout"] == 77
     assert call["max_input_chars"] == 123
     assert call["max_output_chars"] == 456
+    assert call["on_output_batched"] is True
     assert AGENT_DATA_BLOCK_START in str(call["input_data"])
     assert AGENT_DATA_BLOCK_END in str(call["input_data"])
     assert "ORIGEM: full_context" in str(call["input_data"])